@@ -3,10 +3,12 @@ from flask import Flask
 from app.config import Config, FlaskConfig
 from flask_cors import CORS
 from app.extensions import db, bcrypt, jwt, migrate
+from app.utils.json_provider import FastJSONProvider
 import os
 
 def create_app(config_object=None):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     if isinstance(config_object, dict):
         # If a dict is passed (e.g., in tests)
@@ -26,7 +28,8 @@ def create_app(config_object=None):
     migrate.init_app(app, db)
 
     # Paper upload configuration
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
+    UPLOAD_FOLDER = app.config.get('UPLOAD_FOLDER') or os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'uploads')
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
     if not os.path.exists(UPLOAD_FOLDER):
         os.makedirs(UPLOAD_FOLDER)
@@ -36,6 +39,10 @@ def create_app(config_object=None):
         from app.routes import register_blueprints
         register_blueprints(app)
 
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
     # Enable CORS
     from app.config import FlaskConfig
     from flask_cors import CORS
@@ -43,5 +50,9 @@ def create_app(config_object=None):
          methods=FlaskConfig.CORS_METHODS,
          allow_headers=FlaskConfig.CORS_ALLOW_HEADERS, supports_credentials=True)
 
+    # gzip / brotli for JSON and NDJSON responses
+    from app.utils.compression import init_compression
+    init_compression(app)
+
 
     return app
@@ -0,0 +1,79 @@
+# app/commands.py
+"""
+Maintenance CLI commands, e.g.:
+    flask search reindex
+    flask search reindex --user-id 3
+    flask search extract-text
+    flask categories rebuild-tree
+    flask categories reconcile-counts
+"""
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models.user import User
+from app.models.paper import Paper
+from app.utils.changes import mark_changed
+
+search_cli = AppGroup('search', help='Search index maintenance.')
+
+
+@search_cli.command('reindex')
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user.')
+def reindex_command(user_id):
+    """Rebuild the search index from the papers and categories tables"""
+    from app.search import reindex_user
+
+    user_ids = [user_id] if user_id else [u.id for u in User.query.all()]
+    total = 0
+    for uid in user_ids:
+        total += reindex_user(uid)
+        # Postings are bulk-written: bump the user's data version by hand
+        mark_changed(db.session, uid)
+    db.session.commit()
+    click.echo(f"Indexed {total} documents for {len(user_ids)} user(s)")
+
+
+@search_cli.command('extract-text')
+def extract_text_command():
+    """Extract the PDF text of papers uploaded before text capture existed"""
+    from app.utils.pdf_text import build_paper_pages
+
+    papers = Paper.query.filter(~Paper.pages.any()).all()
+    extracted = 0
+    for paper in papers:
+        paper.pages = build_paper_pages(paper.file_path)
+        if paper.pages:
+            extracted += 1
+    db.session.commit()
+    click.echo(f"Extracted text for {extracted} of {len(papers)} paper(s)")
+
+
+categories_cli = AppGroup('categories', help='Category hierarchy maintenance.')
+
+
+@categories_cli.command('rebuild-tree')
+def rebuild_tree_command():
+    """Recompute the category closure table from parent_id"""
+    from app.models.category_closure import rebuild_closure, CategoryClosure
+
+    rebuild_closure(db.session.connection())
+    db.session.commit()
+    click.echo(f"Rebuilt {CategoryClosure.query.count()} ancestry row(s)")
+
+
+@categories_cli.command('reconcile-counts')
+def reconcile_counts_command():
+    """Recompute every category's stored paper and read counters"""
+    from app.models.category_counters import reconcile_counters
+
+    repaired = reconcile_counters(db.session.connection())
+    if repaired:
+        mark_changed(db.session, None)
+    db.session.commit()
+    click.echo(f"Repaired counters of {repaired} category(ies)")
+
+
+def register_commands(app):
+    """Attach all CLI command groups to the app"""
+    app.cli.add_command(search_cli)
+    app.cli.add_command(categories_cli)
@@ -1,19 +1,28 @@
 from .base import paper_categories
 from .user import User 
 from .paper import Paper
+from .paper_page import PaperPage
 from .category import Category
+from .category_closure import CategoryClosure
+from . import category_counters
 from .note import Note
 from .highlights_and_tags import Highlights, Tags, paper_tags
 from .stickynotes import StickyNote
+from .search import SearchPosting
+from .data_version import DataVersion
 
 __all__ = [
     'paper_categories',
     'User',
     'Paper',
+    'PaperPage',
     'Category',
+    'CategoryClosure',
     'Note',
     'Highlights',
     'Tags',
     'paper_tags',
-    'StickyNote'
+    'StickyNote',
+    'SearchPosting',
+    'DataVersion'
 ]
\ No newline at end of file
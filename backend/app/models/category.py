@@ -1,6 +1,7 @@
 import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import func, select
 from app.extensions import db
 
 class Category(db.Model, UserMixin):
@@ -11,27 +12,51 @@ class Category(db.Model, UserMixin):
     parent_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    # Stored counters, kept current by app/models/category_counters.py.
+    # subtree_* count distinct papers in the category and all its descendants.
+    paper_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    read_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    subtree_paper_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    subtree_read_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     children = db.relationship('Category', backref=db.backref('parent', remote_side=[id]))
     papers = db.relationship('Paper', secondary='paper_categories', backref='categories')
     
     # Helper methods
+    @staticmethod
+    def levels(category_ids):
+        """{category_id: depth below its root (roots are 0)} from the closure table"""
+        from app.models.category_closure import CategoryClosure
+        if not category_ids:
+            return {}
+        rows = db.session.execute(
+            select(CategoryClosure.descendant_id, func.max(CategoryClosure.depth))
+            .where(CategoryClosure.descendant_id.in_(category_ids))
+            .group_by(CategoryClosure.descendant_id)
+        ).all()
+        return dict(rows)
+
+    def get_level(self):
+        return self.levels([self.id]).get(self.id, 0)
+
+    def get_ancestor_ids(self):
+        """Ancestor ids, nearest (parent) first"""
+        from app.models.category_closure import CategoryClosure
+        return list(db.session.scalars(
+            select(CategoryClosure.ancestor_id)
+            .where(CategoryClosure.descendant_id == self.id, CategoryClosure.depth > 0)
+            .order_by(CategoryClosure.depth)
+        ))
+
     def get_paper_count(self):
-        return len(self.papers)
-    
+        return self.paper_count
+
     def get_progress(self):
-        # Calculate based on reading activity
-        # For example: percentage of papers read in this category
-        read_count = 0
-        for paper in self.papers:
-            if paper.is_read:
-                read_count += 1
-        
-        if len(self.papers) == 0:
-            return 0
-        return int((read_count / len(self.papers)) * 100)
-    
+        # Percentage of the category's papers that are read
+        return _progress(self.paper_count, self.read_count)
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -40,8 +65,16 @@ class Category(db.Model, UserMixin):
             'icon': self.icon,
             'parent_id': self.parent_id,
             'user_id': self.user_id,
-            'created_at': self.created_at.isoformat(),
-            'paper_count': self.get_paper_count(),
-            'progress': self.get_progress()
+            'created_at': self.created_at,
+            'paper_count': self.paper_count,
+            'progress': _progress(self.paper_count, self.read_count),
+            'subtree_paper_count': self.subtree_paper_count,
+            'subtree_progress': _progress(self.subtree_paper_count, self.subtree_read_count)
             # "children": [child.id for child in self.children]  # or [child.to_dict() for full info]
-        }
\ No newline at end of file
+        }
+
+
+def _progress(paper_count, read_count):
+    if paper_count == 0:
+        return 0
+    return int((read_count / paper_count) * 100)
@@ -0,0 +1,122 @@
+from sqlalchemy import event, select, insert, delete, literal, text, true
+from app.extensions import db
+from app.models.category import Category
+
+# Closure table of the category hierarchy: one row per (ancestor, descendant)
+# pair, including each category paired with itself at depth 0. Subtree,
+# ancestor and depth questions become one indexed lookup at any tree size.
+# Rows are maintained by the mapper events below, inside the same flush as
+# the category change, so the table commits (or rolls back) with it.
+class CategoryClosure(db.Model):
+    __tablename__ = 'category_closure'
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('category.id'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('category.id'), primary_key=True)
+    depth = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_category_closure_descendant', 'descendant_id', 'depth'),
+    )
+
+    def __repr__(self):
+        return f"CategoryClosure({self.ancestor_id} -> {self.descendant_id}, {self.depth})"
+
+
+closure = CategoryClosure.__table__
+
+# Rebuilds the whole table from parent_id; also used by the migration
+REBUILD_SQL = """
+WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM category
+    UNION ALL
+    SELECT tree.ancestor_id, category.id, tree.depth + 1
+    FROM tree JOIN category ON category.parent_id = tree.descendant_id
+)
+INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+
+def link_node(connection, category_id, parent_id):
+    """Add a new leaf: its self row plus one row per ancestor of the parent"""
+    connection.execute(insert(closure).values(ancestor_id=category_id, descendant_id=category_id, depth=0))
+    if parent_id is not None:
+        connection.execute(insert(closure).from_select(
+            ['ancestor_id', 'descendant_id', 'depth'],
+            select(closure.c.ancestor_id, literal(category_id), closure.c.depth + 1)
+            .where(closure.c.descendant_id == parent_id)
+        ))
+
+
+def detach_subtree(connection, category_id):
+    """Cut the links between a subtree and everything above its root"""
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == category_id)
+    above = select(closure.c.ancestor_id).where(closure.c.descendant_id == category_id, closure.c.depth > 0)
+    connection.execute(delete(closure).where(
+        closure.c.descendant_id.in_(subtree.scalar_subquery()),
+        closure.c.ancestor_id.in_(above.scalar_subquery())
+    ))
+
+
+def detach_children(connection, category_id):
+    """detach_subtree() for every child of a category at once"""
+    below = select(closure.c.descendant_id).where(closure.c.ancestor_id == category_id, closure.c.depth > 0)
+    above = select(closure.c.ancestor_id).where(closure.c.descendant_id == category_id)
+    connection.execute(delete(closure).where(
+        closure.c.descendant_id.in_(below.scalar_subquery()),
+        closure.c.ancestor_id.in_(above.scalar_subquery())
+    ))
+
+
+def move_subtree(connection, category_id, new_parent_id):
+    """Re-hang a subtree under new_parent_id (None = root)"""
+    detach_subtree(connection, category_id)
+    if new_parent_id is None:
+        return
+    above = closure.alias('above')
+    below = closure.alias('below')
+    connection.execute(insert(closure).from_select(
+        ['ancestor_id', 'descendant_id', 'depth'],
+        select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+        .select_from(above.join(below, true()))
+        .where(above.c.descendant_id == new_parent_id, below.c.ancestor_id == category_id)
+    ))
+
+
+def unlink_node(connection, category_id):
+    """Drop every row mentioning a category (its children must be moved first)"""
+    connection.execute(delete(closure).where(
+        (closure.c.ancestor_id == category_id) | (closure.c.descendant_id == category_id)
+    ))
+
+
+def rebuild_closure(connection):
+    """Recompute the whole table from parent_id (backfill / repair)"""
+    connection.execute(delete(closure))
+    connection.execute(text(REBUILD_SQL))
+
+
+def current_parent(connection, category_id):
+    return connection.execute(
+        select(closure.c.ancestor_id).where(closure.c.descendant_id == category_id, closure.c.depth == 1)
+    ).scalar()
+
+
+# ============= CLOSURE MAINTENANCE EVENTS =============
+
+@event.listens_for(Category, 'after_insert')
+def _after_insert(mapper, connection, target):
+    link_node(connection, target.id, target.parent_id)
+
+
+@event.listens_for(Category, 'after_update')
+def _after_update(mapper, connection, target):
+    # parent_id may be set through the `parent` relationship, whose column
+    # history is not reliable here; compare with the stored parent instead
+    if current_parent(connection, target.id) != target.parent_id:
+        move_subtree(connection, target.id, target.parent_id)
+
+
+@event.listens_for(Category, 'before_delete')
+def _before_delete(mapper, connection, target):
+    unlink_node(connection, target.id)
@@ -0,0 +1,139 @@
+from sqlalchemy import event, inspect, select, update, func, or_, true
+from sqlalchemy.orm import Session
+from app.models.base import paper_categories
+from app.models.paper import Paper
+from app.models.category import Category
+from app.models.category_closure import closure, current_parent
+
+# Category.paper_count/read_count count the papers filed directly in a
+# category; subtree_paper_count/subtree_read_count count the distinct papers
+# filed anywhere in its subtree. They are read on every category listing, so
+# they are stored rather than computed per request.
+#
+# A before_flush hook notes which categories a flush touches (papers added
+# to or removed from them, read status changes, deleted papers, moved or
+# deleted categories) and, just before the transaction commits, those
+# categories and all their ancestors are recounted with set-based UPDATEs.
+# Bulk statements bypass the hook: call mark_counts_stale() next to them.
+
+_category = Category.__table__
+
+
+def _direct_counts(read_only=False):
+    query = (
+        select(func.count(Paper.id))
+        .select_from(paper_categories.join(Paper.__table__, Paper.id == paper_categories.c.paper_id))
+        .where(paper_categories.c.category_id == _category.c.id)
+    )
+    if read_only:
+        query = query.where(Paper.is_read == true())
+    return query.scalar_subquery()
+
+
+def _subtree_counts(read_only=False):
+    query = (
+        select(func.count(paper_categories.c.paper_id.distinct()))
+        .select_from(
+            closure.join(paper_categories, paper_categories.c.category_id == closure.c.descendant_id)
+            .join(Paper.__table__, Paper.id == paper_categories.c.paper_id)
+        )
+        .where(closure.c.ancestor_id == _category.c.id)
+    )
+    if read_only:
+        query = query.where(Paper.is_read == true())
+    return query.scalar_subquery()
+
+
+def _counters():
+    return {
+        'paper_count': _direct_counts(),
+        'read_count': _direct_counts(read_only=True),
+        'subtree_paper_count': _subtree_counts(),
+        'subtree_read_count': _subtree_counts(read_only=True),
+    }
+
+
+def refresh_counters(connection, category_ids):
+    """Recount the given categories and every ancestor of them"""
+    category_ids = list(category_ids)
+    if not category_ids:
+        return
+    ancestors = select(closure.c.ancestor_id).where(closure.c.descendant_id.in_(category_ids))
+    counters = _counters()
+    connection.execute(
+        update(_category)
+        .where(_category.c.id.in_(category_ids))
+        .values(paper_count=counters['paper_count'], read_count=counters['read_count'])
+    )
+    connection.execute(
+        update(_category)
+        .where(or_(_category.c.id.in_(category_ids), _category.c.id.in_(ancestors)))
+        .values(
+            subtree_paper_count=counters['subtree_paper_count'],
+            subtree_read_count=counters['subtree_read_count']
+        )
+    )
+
+
+def reconcile_counters(connection):
+    """Recount every category; returns how many had drifted"""
+    counters = _counters()
+    result = connection.execute(
+        update(_category)
+        .where(or_(*(_category.c[name] != value for name, value in counters.items())))
+        .values(**counters)
+    )
+    return result.rowcount
+
+
+def mark_counts_stale(session, categories):
+    """Recount these categories (ids or Category objects) and their ancestors before the session commits"""
+    session.info.setdefault('stale_counters', []).extend(c for c in categories if c is not None)
+
+
+def _changed_categories(state, key):
+    history = state.attrs[key].history
+    return list(history.added or ()) + list(history.deleted or ())
+
+
+@event.listens_for(Session, 'before_flush')
+def _note_stale_counters(session, flush_context, instances):
+    stale = []
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Paper):
+                stale.extend(obj.categories)
+        for obj in session.dirty:
+            state = inspect(obj)
+            if isinstance(obj, Paper):
+                if state.attrs.is_read.history.has_changes():
+                    stale.extend(obj.categories)
+                else:
+                    stale.extend(_changed_categories(state, 'categories'))
+            elif isinstance(obj, Category):
+                stale.extend(_changed_categories(state, 'papers'))
+                if state.attrs.parent_id.history.has_changes() or state.attrs.parent.history.has_changes():
+                    # The old ancestors lose the subtree; the closure still has them
+                    stale.extend([obj, current_parent(session.connection(), obj.id)])
+        for obj in session.deleted:
+            if isinstance(obj, Paper):
+                stale.extend(obj.categories)
+            elif isinstance(obj, Category):
+                stale.append(obj.parent_id)
+    if stale:
+        mark_counts_stale(session, stale)
+
+
+@event.listens_for(Session, 'before_commit')
+def _refresh_stale_counters(session):
+    session.flush()
+    stale = session.info.pop('stale_counters', None)
+    if stale:
+        # Objects were recorded before they had ids; they have them now
+        ids = {c.id if isinstance(c, Category) else c for c in stale}
+        refresh_counters(session.connection(), ids - {None})
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stale_counters(session):
+    session.info.pop('stale_counters', None)
@@ -0,0 +1,13 @@
+from app.extensions import db
+
+# Per-user change counter behind the ETags of list endpoints.
+# Bumped in the same transaction as every write to the user's rows (see
+# app/utils/versions.py). Row user_id = 0 counts writes to shared rows (tags).
+class DataVersion(db.Model):
+    __tablename__ = 'data_version'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"DataVersion({self.user_id}, {self.version})"
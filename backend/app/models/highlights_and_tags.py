@@ -26,7 +26,7 @@ class Highlights(db.Model):
             'end_offset': self.end_offset,
             'color': self.color,
             'text_content': self.text_content,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
 
 
@@ -53,12 +53,14 @@ class Tags(db.Model):
             'id': self.id,
             'name': self.name,
             'color': self.color,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
     
 
 # association table paper_tags (paper_id, tag_id)
 paper_tags = db.Table('paper_tags',
     db.Column('paper_id', db.Integer, db.ForeignKey('paper.id'), primary_key=True),
-    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True),
+    # The primary key leads with paper_id; this serves tag -> papers lookups
+    db.Index('ix_paper_tags_tag_id', 'tag_id')
 )
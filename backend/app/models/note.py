@@ -17,7 +17,7 @@ class Note(db.Model, UserMixin):
         return {
             'id': self.id,
             'content': self.content,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'paper_id': self.paper_id,
             'user_id': self.user_id
         }
\ No newline at end of file
@@ -10,7 +10,7 @@ class Paper(db.Model):
     abstract = db.Column(db.Text)
     is_read = db.Column(db.Boolean, default=False) 
     file_path = db.Column(db.String(300), nullable=False)
-    upload_date = db.Column(db.DateTime, default=datetime.datetime.utcnow())
+    upload_date = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     #Relationship
     tags = db.relationship('Tags', secondary='paper_tags', back_populates='papers')
@@ -20,20 +20,24 @@ class Paper(db.Model):
     notes = db.relationship('Note', backref='paper', lazy=True)
     sticky_notes = db.relationship('StickyNote', backref='paper', lazy=True, cascade='all, delete-orphan')
 
+    # Extracted PDF text, one row per page
+    pages = db.relationship('PaperPage', backref='paper', lazy=True, cascade='all, delete-orphan',
+                            order_by='PaperPage.page_number')
+
+    # Serves the newest-first keyset pagination of GET /api/papers
+    __table_args__ = (
+        db.Index('ix_paper_user_upload_date', 'user_id', upload_date.desc(), id.desc()),
+    )
+
 
 
 
     def __repr__(self):
         return f"Paper('{self.title}', '{self.authors}')"
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'authors': self.authors,
-            'abstract': self.abstract,
-            'is_read': self.is_read,
-            'file_path': self.file_path,
-            'upload_date': self.upload_date.isoformat(),
-            'user_id': self.user_id
-        }
\ No newline at end of file
+    # Serializable columns, in output order
+    FIELDS = ('id', 'title', 'authors', 'abstract', 'is_read', 'file_path', 'upload_date', 'user_id')
+
+    def to_dict(self, fields=None):
+        """Serialize the paper; `fields` restricts the output (and the attributes touched)"""
+        return {field: getattr(self, field) for field in fields or self.FIELDS}
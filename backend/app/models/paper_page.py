@@ -0,0 +1,33 @@
+import zlib
+from app.extensions import db
+
+# Text layer of one PDF page, extracted once at upload time.
+# Stored zlib-compressed; the search index lives in paper_page_fts (SQLite)
+# or paper_page.search_vector (PostgreSQL), see app/search/pages.py.
+class PaperPage(db.Model):
+    __tablename__ = 'paper_page'
+
+    id = db.Column(db.Integer, primary_key=True)
+    paper_id = db.Column(db.Integer, db.ForeignKey('paper.id'), nullable=False, index=True)
+    page_number = db.Column(db.Integer, nullable=False)
+    content = db.Column(db.LargeBinary, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('paper_id', 'page_number', name='uq_paper_page_number'),
+    )
+
+    @classmethod
+    def from_text(cls, page_number, text):
+        page = cls(page_number=page_number, content=zlib.compress(text.encode('utf-8')))
+        page._text = text  # spare the index listener a decompress
+        return page
+
+    @property
+    def text(self):
+        cached = getattr(self, '_text', None)
+        if cached is None:
+            cached = zlib.decompress(self.content).decode('utf-8')
+        return cached
+
+    def __repr__(self):
+        return f"PaperPage({self.paper_id}, page {self.page_number})"
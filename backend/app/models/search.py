@@ -0,0 +1,20 @@
+from app.extensions import db
+
+# Inverted index behind /api/search-all.
+# One row per (user, trigram, document); documents are papers (title + authors)
+# and categories (name). Rows are maintained by the mapper events in
+# app/search/index.py, so the table never has to be rebuilt at query time.
+class SearchPosting(db.Model):
+    __tablename__ = 'search_posting'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    token = db.Column(db.String(16), primary_key=True)
+    doc_type = db.Column(db.String(20), primary_key=True)
+    doc_id = db.Column(db.Integer, primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_search_posting_doc', 'doc_type', 'doc_id'),
+    )
+
+    def __repr__(self):
+        return f"SearchPosting('{self.token}', '{self.doc_type}', {self.doc_id})"
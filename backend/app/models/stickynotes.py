@@ -27,5 +27,5 @@ class StickyNote(db.Model, UserMixin):
             'width': self.width,
             'height': self.height,
             'content': self.content,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
\ No newline at end of file
@@ -13,6 +13,7 @@ def register_blueprints(app):
     from app.routes.tags import tags_bp
     from app.routes.stickynotes import stickynotes_bp
     from app.routes.mainpage import main_bp
+    from app.routes.export import export_bp
     # Register all blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(papers_bp)  # Already has prefix in file
@@ -22,5 +23,6 @@ def register_blueprints(app):
     app.register_blueprint(tags_bp)  # ← NO PREFIX! Routes define full paths
     app.register_blueprint(stickynotes_bp)  # Already has prefix in file
     app.register_blueprint(main_bp)
+    app.register_blueprint(export_bp)
     
     print("✓ All blueprints registered successfully")
\ No newline at end of file
@@ -5,6 +5,7 @@ from app.extensions import db
 from app.models.category import Category
 from app.models.paper import Paper
 from app.models.base import paper_categories
+from sqlalchemy import select, update, delete, case
 import re
 import logging
 from app.utils.category_utils import (
@@ -13,8 +14,22 @@ from app.utils.category_utils import (
     validate_icon_format,
     validate_parent_exists,
     collect_descendant_ids,
-    check_name_conflict
+    check_name_conflict,
+    root_renames
 )
+from app.models.category_closure import detach_children
+from app.models.category_counters import mark_counts_stale
+from app.utils.changes import mark_changed
+from app.search.index import write_postings
+from app.utils.papers import (
+    parse_paper_fields,
+    paper_projection,
+    parse_paper_filters,
+    filter_papers,
+    PAPER_SORTS
+)
+from app.utils.pagination import InvalidCursor, parse_limit, keyset_page, scope_of
+from app.utils.versions import conditional
 
 # — Unique blueprint name + URL prefix to avoid collisions across the app
 categories_bp = Blueprint('categories_bp', __name__, url_prefix='/api/categories')
@@ -26,6 +41,7 @@ logger = logging.getLogger(__name__)
 # View all categories
 @categories_bp.route('/view_all', methods=['GET'])
 @jwt_required()
+@conditional
 def view_all_categories():
     """Display all top-level categories (categories without parents)."""
     try:
@@ -41,25 +57,113 @@ def view_all_categories():
         return jsonify({"error": "Failed to retrieve categories"}), 500
 
 
+# Whole category tree in one response
+@categories_bp.route('/tree', methods=['GET'])
+@jwt_required()
+@conditional
+def category_tree():
+    """Return all of the user's categories nested under their parents, with counts."""
+    try:
+        user_id = get_jwt_identity()
+        categories = Category.query.filter_by(user_id=user_id).order_by(Category.name, Category.id).all()
+
+        # One pass to create the nodes, one to hang each under its parent
+        nodes = {}
+        for cat in categories:
+            node = cat.to_dict()
+            node['children'] = []
+            nodes[cat.id] = node
+        roots = []
+        for cat in categories:
+            parent = nodes.get(cat.parent_id)
+            (parent['children'] if parent else roots).append(nodes[cat.id])
+
+        logger.info(f"Retrieved category tree of {len(categories)} categories for user {user_id}")
+        return jsonify({"tree": roots, "total": len(categories)}), 200
+    except Exception as e:
+        logger.error(f"Error retrieving category tree for user {user_id}: {str(e)}")
+        return jsonify({"error": "Failed to retrieve category tree"}), 500
+
+
 # View a specific category and its papers
 @categories_bp.route('/view/<int:category_id>', methods=['GET'])
 @jwt_required()
 def view_category(category_id):
-    """Return a specific category and its papers in JSON."""
+    """Return a specific category and its papers in JSON (?fields= limits paper columns)."""
+    try:
+        fields = parse_paper_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         user_id = get_jwt_identity()
         category = Category.query.filter_by(id=category_id, user_id=user_id).first_or_404()
+        papers_query = Paper.query.with_parent(category, Category.papers)
+        if fields:
+            papers_query = papers_query.options(paper_projection(fields))
+        papers = papers_query.all()
         logger.info(f"Retrieved category {category_id} for user {user_id}")
         return jsonify({
             "category": category.to_dict(),
-            "papers": [paper.to_dict() for paper in category.papers],
-            "paper_count": len(category.papers)
+            "papers": [paper.to_dict(fields) for paper in papers],
+            "paper_count": len(papers)
         }), 200
     except Exception as e:
         logger.error(f"Error retrieving category {category_id} for user {user_id}: {str(e)}")
         return jsonify({"error": "Failed to retrieve category"}), 500
 
 
+# Page through a category's papers, optionally with its subcategories
+@categories_bp.route('/<int:category_id>/papers', methods=['GET'])
+@jwt_required()
+@conditional
+def list_category_papers(category_id):
+    """
+    One page of a category's papers (?limit=&cursor=), each paper once even when
+    filed in several categories of the subtree with ?include_descendants=1.
+    Takes the filter, sort and ?fields= arguments of /api/papers.
+    """
+    try:
+        limit = parse_limit()
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        fields = parse_paper_fields()
+        filters = parse_paper_filters()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    filters['category_id'] = category_id
+
+    try:
+        user_id = get_jwt_identity()
+        try:
+            query = filter_papers(Paper.query.filter_by(user_id=user_id), filters, user_id)
+        except LookupError:
+            return jsonify({"error": "Category not found."}), 404
+
+        sort_column, descending = PAPER_SORTS[filters['sort']]
+        if fields:
+            query = query.options(paper_projection(fields, sort_column))
+        try:
+            papers, next_cursor = keyset_page(
+                query, sort_column, Paper.id,
+                limit, request.args.get('cursor'),
+                scope=scope_of('category_papers', **filters), descending=descending
+            )
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+
+        logger.info(f"Retrieved {len(papers)} papers of category {category_id} for user {user_id}")
+        return jsonify({
+            "category_id": category_id,
+            "papers": [paper.to_dict(fields) for paper in papers],
+            "next_cursor": next_cursor
+        }), 200
+    except Exception as e:
+        logger.error(f"Error retrieving papers of category {category_id} for user {user_id}: {str(e)}")
+        return jsonify({"error": "Failed to retrieve category papers"}), 500
+
+
 # Create a new category
 @categories_bp.route('/create', methods=['POST'])
 @jwt_required()
@@ -131,9 +235,10 @@ def get_available_parents(category_id):
             ~Category.id.in_(descendant_ids)
         ).order_by(Category.name).all()
 
+        levels = Category.levels([cat.id for cat in valid_parents])
         logger.info(f"Retrieved {len(valid_parents)} valid parent options for category {category_id}")
         return jsonify([
-            {"id": cat.id, "name": cat.name, "level": cat.get_level()}
+            {"id": cat.id, "name": cat.name, "level": levels.get(cat.id, 0)}
             for cat in valid_parents
         ]), 200
 
@@ -240,35 +345,43 @@ def delete_category(category_id):
     """Delete a category with proper child reassignment and name conflict resolution."""
     try:
         user_id = get_jwt_identity()
-        with db.session.begin():
-            category = Category.query.filter_by(id=category_id, user_id=user_id).first_or_404()
-            children = category.children  # adjust .all() if children is dynamic
-
-            logger.info(f"Processing {len(children)} child categories for deletion of category {category_id}")
-            for child in children:
-                existing = Category.query.filter_by(
-                    name=child.name, parent_id=None, user_id=user_id
-                ).first()
-
-                if existing:
-                    base_name = child.name
-                    suffix = 1
-                    new_name = f"{base_name} (moved)"
-                    while Category.query.filter_by(name=new_name, parent_id=None, user_id=user_id).first():
-                        suffix += 1
-                        new_name = f"{base_name} (moved {suffix})"
-                    logger.info(f"Renaming child category '{child.name}' to '{new_name}' to avoid conflict")
-                    child.name = new_name
-
-                child.parent_id = None
-
-            paper_count = len(category.papers)
-            category.papers.clear()
-            category_name = category.name
-            db.session.delete(category)
-
-            logger.info(f"Deleted category '{category_name}' (ID: {category_id}), reassigned {len(children)} children, detached {paper_count} papers")
+        category = Category.query.filter_by(id=category_id, user_id=user_id).first()
+        if not category:
+            return jsonify({"error": "Category not found."}), 404
+        category_name = category.name
+
+        # Children become roots; those whose name is taken there get a "(moved N)" suffix
+        children = db.session.execute(
+            select(Category.id, Category.name).where(Category.parent_id == category_id)
+        ).all()
+        logger.info(f"Processing {len(children)} child categories for deletion of category {category_id}")
+        renames = root_renames(children, user_id, exclude_id=category_id)
+        for child_id, new_name in renames.items():
+            logger.info(f"Renaming child category {child_id} to '{new_name}' to avoid conflict")
+
+        values = {"parent_id": None}
+        if renames:
+            values["name"] = case(renames, value=Category.id, else_=Category.name)
+        # Bulk statements skip the mapper events: keep the closure table,
+        # the counters, the search index and the change tracking in step by hand
+        connection = db.session.connection()
+        detach_children(connection, category_id)
+        db.session.execute(
+            update(Category).where(Category.parent_id == category_id).values(**values),
+            execution_options={"synchronize_session": False}
+        )
+        paper_count = db.session.execute(
+            delete(paper_categories).where(paper_categories.c.category_id == category_id)
+        ).rowcount
+        for child_id, new_name in renames.items():
+            write_postings(connection, 'category', child_id, category.user_id, [new_name])
+        mark_counts_stale(db.session, [category.parent_id])
+        mark_changed(db.session, user_id)
+
+        db.session.delete(category)
+        db.session.commit()
 
+        logger.info(f"Deleted category '{category_name}' (ID: {category_id}), reassigned {len(children)} children, detached {paper_count} papers")
         return jsonify({
             "message": "Category deleted successfully.",
             "details": {
@@ -0,0 +1,69 @@
+# app/routes/export.py
+"""
+Library Export
+Handles: streaming NDJSON export of a user's papers and everything attached
+"""
+import datetime
+from flask import Blueprint, Response, current_app, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.models.paper import Paper
+from app.utils.papers import format_category_data
+
+export_bp = Blueprint('export', __name__, url_prefix='/api')
+
+# Papers fetched (and their collections selectin-loaded) per round trip
+EXPORT_BATCH_SIZE = 200
+
+
+def paper_export_record(paper):
+    """One NDJSON line: the paper with its categories, tags and annotations"""
+    record = {'type': 'paper'}
+    record.update(paper.to_dict())
+    record.update({
+        'categories': [format_category_data(c) for c in paper.categories],
+        'tags': [t.to_dict() for t in paper.tags],
+        'notes': [n.to_dict() for n in paper.notes],
+        'highlights': [h.to_dict() for h in paper.highlights],
+        'sticky_notes': [s.to_dict() for s in paper.sticky_notes]
+    })
+    return record
+
+
+def iter_library(user_id):
+    """
+    Yield the user's papers one by one. yield_per streams rows from a
+    server-side cursor and the selectin loaders run once per batch, so only
+    one batch is ever held in memory.
+    """
+    stmt = select(Paper).filter_by(user_id=user_id).order_by(Paper.id).options(
+        selectinload(Paper.categories),
+        selectinload(Paper.tags),
+        selectinload(Paper.notes),
+        selectinload(Paper.highlights),
+        selectinload(Paper.sticky_notes)
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    yield from db.session.scalars(stmt)
+
+
+@export_bp.route('/export.ndjson', methods=['GET'])
+@jwt_required()
+def export_library():
+    """Stream the whole library as newline-delimited JSON, one paper per line"""
+    user_id = int(get_jwt_identity())
+    dumps = current_app.json.dumps
+
+    def generate():
+        # Sent before the first query so the download starts right away
+        yield dumps({'type': 'export', 'user_id': user_id,
+                     'exported_at': datetime.datetime.utcnow()}) + '\n'
+        for paper in iter_library(user_id):
+            yield dumps(paper_export_record(paper)) + '\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename="library.ndjson"'}
+    )
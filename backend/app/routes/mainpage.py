@@ -1,24 +1,42 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select, func, case
+from app.extensions import db
 from app.models.paper import Paper
 from app.models.category import Category
-from rapidfuzz import fuzz   # <-- FIX HERE
+from app.utils.papers import parse_paper_fields, paper_projection
+from app.utils.versions import conditional
+from app.search import cached_search, get_result_cache, suggest, InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 main_bp = Blueprint('main', __name__, url_prefix="/api")
 
 
 @main_bp.route('/dashboard')
 @jwt_required()
+@conditional
 def api_dashboard():
     user_id = get_jwt_identity()
-    
-    recent_papers = Paper.query.filter_by(user_id=user_id)\
-        .order_by(Paper.upload_date.desc()).limit(5).all()
+
+    try:
+        fields = parse_paper_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    recent_query = Paper.query.filter_by(user_id=user_id)
+    if fields:
+        recent_query = recent_query.options(paper_projection(fields))
+    recent_papers = recent_query.order_by(Paper.upload_date.desc(), Paper.id.desc()).limit(5).all()
     user_categories = Category.query.filter_by(user_id=user_id).all()
+    # Library totals in one aggregate, so the client never pages through every paper for them
+    total, read = db.session.execute(
+        select(func.count(Paper.id), func.coalesce(func.sum(case((Paper.is_read, 1), else_=0)), 0))
+        .where(Paper.user_id == user_id)
+    ).one()
 
     return jsonify({
-        "recent_papers": [p.to_dict() for p in recent_papers],
-        "user_categories": [c.to_dict() for c in user_categories]
+        "recent_papers": [p.to_dict(fields) for p in recent_papers],
+        "user_categories": [c.to_dict() for c in user_categories],
+        "paper_stats": {"total": total, "read": read}
     }), 200
 
 
@@ -26,40 +44,40 @@ def api_dashboard():
 @jwt_required()
 def search_all():
     user_id = get_jwt_identity()
-    query = request.args.get('q', '').strip().lower()
+    query = ' '.join(request.args.get('q', '').split()).lower()
 
     if not query:
         return jsonify({"error": "Search query is required."}), 400
 
-    results = []
-
-    papers = Paper.query.filter_by(user_id=user_id).all()
-    categories = Category.query.filter_by(user_id=user_id).all()
-
-    # Search in papers
-    for paper in papers:
-        title = (paper.title or "").lower()
-        authors = (paper.authors or "").lower()
-
-        if fuzz.partial_ratio(query, title) >= 70 or fuzz.partial_ratio(query, authors) >= 70:
-            results.append({
-                "type": "paper",
-                "id": paper.id,
-                "title": paper.title,
-                "authors": paper.authors
-            })
-
-    # Search in categories
-    for category in categories:
-        name = (category.name or "").lower()
-        if fuzz.partial_ratio(query, name) >= 70:
-            results.append({
-                "type": "category",
-                "id": category.id,
-                "name": category.name
-            })
-
-    if not results:
-        return jsonify({"message": "No results found."}), 404
-
-    return jsonify({"results": results}), 200
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    try:
+        page = cached_search(user_id, query, limit=limit, cursor=request.args.get('cursor'))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(page), 200
+
+
+@main_bp.route('/search/suggest', methods=['GET'])
+@jwt_required()
+def search_suggest():
+    """Prefix completions over titles, author surnames, tags and categories"""
+    user_id = get_jwt_identity()
+    prefix = request.args.get('q', '').strip()
+
+    if not prefix:
+        return jsonify({"error": "Search query is required."}), 400
+
+    return jsonify({"suggestions": suggest(user_id, prefix)}), 200
+
+
+@main_bp.route('/search/cache-stats', methods=['GET'])
+@jwt_required()
+def search_cache_stats():
+    """Hit/miss counters of this process's search result cache"""
+    return jsonify(get_result_cache().stats()), 200
@@ -1,13 +1,17 @@
 # app/routes/papers.py
 """
 Paper CRUD Operations
-Handles: upload, view, download, delete, read/unread status, categories
+Handles: upload, view, workspace, download, delete, read/unread status, categories
 """
 from flask import Blueprint, request, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import selectinload
 from app.extensions import db
 from app.models.paper import Paper
 from app.models.category import Category
+from app.models.note import Note
+from app.models.highlights_and_tags import Highlights
+from app.models.stickynotes import StickyNote
 from app.utils.papers import (
     create_success_response, 
     create_error_response,
@@ -17,11 +21,24 @@ from app.utils.papers import (
     format_paper_data,
     get_user_categories,
     associate_paper_with_category,
-    format_paper_data
+    parse_paper_fields,
+    paper_projection,
+    format_note_data,
+    format_category_data,
+    parse_paper_filters,
+    filter_papers,
+    PAPER_SORTS
 )
+from app.utils.pdf_text import build_paper_pages
+from app.utils.versions import conditional
+from app.utils.pagination import InvalidCursor, keyset_page, parse_limit, scope_of
+from app.search import related_papers
 
 papers_bp = Blueprint('papers', __name__, url_prefix='/api/papers')
 
+# Upper bound on ids per POST /api/papers/batch-get
+BATCH_GET_MAX = 100
+
 
 @papers_bp.route('/upload', methods=['POST'])
 @jwt_required()
@@ -48,6 +65,8 @@ def upload_paper():
         file_path=file_path,
         user_id=user_id
     )
+    # Capture the text layer once; search never re-opens the PDF
+    paper.pages = build_paper_pages(file_path)
     
     db.session.add(paper)
     associate_paper_with_category(paper, form_data.get('category_id'))
@@ -74,6 +93,117 @@ def view_paper(paper_id):
     )
 
 
+@papers_bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_papers():
+    """
+    Get several papers in one query: {"ids": [...]} (at most BATCH_GET_MAX).
+    Papers come back in request order; ids that are invalid, missing or
+    someone else's are listed under "errors" instead of failing the call.
+    """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('ids'), list):
+        return create_error_response('ids must be a list of paper ids', 400)
+    if len(data['ids']) > BATCH_GET_MAX:
+        return create_error_response(f'At most {BATCH_GET_MAX} ids per request', 400)
+
+    try:
+        fields = parse_paper_fields()
+    except ValueError as e:
+        return create_error_response(str(e), 400)
+
+    errors = []
+    ids = []
+    for raw_id in data['ids']:
+        if isinstance(raw_id, int) and not isinstance(raw_id, bool):
+            if raw_id not in ids:
+                ids.append(raw_id)
+        else:
+            errors.append({'id': raw_id, 'error': 'Invalid paper id'})
+
+    query = Paper.query.filter(Paper.id.in_(ids), Paper.user_id == get_jwt_identity())
+    if fields:
+        query = query.options(paper_projection(fields))
+    found = {paper.id: paper for paper in query.all()} if ids else {}
+
+    errors += [{'id': paper_id, 'error': 'Paper not found'} for paper_id in ids if paper_id not in found]
+    return create_success_response(
+        'Papers retrieved successfully',
+        {
+            'papers': [format_paper_data(found[paper_id], fields) for paper_id in ids if paper_id in found],
+            'errors': errors
+        }
+    )
+
+
+@papers_bp.route('/<int:paper_id>/workspace', methods=['GET'])
+@jwt_required()
+def get_paper_workspace(paper_id):
+    """Get a paper with its notes, highlights, sticky notes, tags and categories"""
+    user_id = get_jwt_identity()
+    # One query for the paper plus one per collection, whatever their sizes
+    paper = Paper.query.filter_by(id=paper_id, user_id=user_id).options(
+        selectinload(Paper.notes.and_(Note.user_id == user_id)),
+        selectinload(Paper.highlights.and_(Highlights.user_id == user_id)),
+        selectinload(Paper.sticky_notes.and_(StickyNote.user_id == user_id)),
+        selectinload(Paper.tags),
+        selectinload(Paper.categories)
+    ).first()
+    if not paper:
+        return create_error_response('Paper not found', 404)
+
+    newest_first = lambda item: (item.created_at, item.id)
+    return create_success_response(
+        'Paper workspace retrieved successfully',
+        {
+            'paper': format_paper_data(paper),
+            'notes': [format_note_data(n) for n in sorted(paper.notes, key=newest_first, reverse=True)],
+            'highlights': [h.to_dict() for h in sorted(paper.highlights, key=newest_first, reverse=True)],
+            'sticky_notes': [s.to_dict() for s in paper.sticky_notes],
+            'tags': [t.to_dict() for t in paper.tags],
+            'categories': [format_category_data(c) for c in paper.categories]
+        }
+    )
+
+
+@papers_bp.route('/<int:paper_id>/related', methods=['GET'])
+@jwt_required()
+def get_related_papers(paper_id):
+    """Get the user's papers most similar to this one (local TF-IDF vectors)"""
+    paper, error = get_user_paper_or_404(paper_id)
+    if error:
+        return error
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return create_error_response('limit must be an integer', 400)
+    limit = max(1, min(limit, 50))
+    
+    user_id = get_jwt_identity()
+    ranked = related_papers(user_id, paper_id, limit)
+    papers = {p.id: p for p in Paper.query.filter(
+        Paper.user_id == user_id,
+        Paper.id.in_([related_id for related_id, _ in ranked])
+    ).all()} if ranked else {}
+    
+    return create_success_response(
+        'Related papers retrieved successfully',
+        {
+            'paper_id': paper_id,
+            'related': [
+                {
+                    'id': related_id,
+                    'title': papers[related_id].title,
+                    'authors': papers[related_id].authors,
+                    'score': round(score, 4)
+                }
+                for related_id, score in ranked if related_id in papers
+            ]
+        }
+    )
+
+
 @papers_bp.route('/<int:paper_id>/download', methods=['GET'])
 @jwt_required()
 def download_paper(paper_id):
@@ -137,19 +267,51 @@ def get_categories():
 
 @papers_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional
 def get_all_papers():
-    """Get all papers for the current user"""
+    """
+    Get one page of the current user's papers (?limit=&cursor=), optionally
+    filtered by is_read, tag_id, category_id[&include_descendants=1],
+    uploaded_after/uploaded_before and sorted by ?sort=newest|oldest|title|author
+    """
     user_id = get_jwt_identity()
-    
-    # Get all papers ordered by upload date (newest first)
-    papers = Paper.query.filter_by(user_id=user_id)\
-                        .order_by(Paper.upload_date.desc()).all()
-    
+
+    try:
+        limit = parse_limit()
+    except ValueError:
+        return create_error_response('limit must be an integer', 400)
+
+    try:
+        fields = parse_paper_fields()
+        filters = parse_paper_filters()
+    except ValueError as e:
+        return create_error_response(str(e), 400)
+
+    try:
+        query = filter_papers(Paper.query.filter_by(user_id=user_id), filters, user_id)
+    except LookupError as e:
+        return create_error_response(str(e), 404)
+
+    sort_column, descending = PAPER_SORTS[filters['sort']]
+    if fields:
+        # The sort key is always loaded: the next cursor is built from it
+        query = query.options(paper_projection(fields, sort_column))
+
+    try:
+        papers, next_cursor = keyset_page(
+            query, sort_column, Paper.id,
+            limit, request.args.get('cursor'),
+            scope=scope_of('papers', **filters), descending=descending
+        )
+    except InvalidCursor as e:
+        return create_error_response(str(e), 400)
+
     return create_success_response(
         'Papers retrieved successfully',
-        {'papers': [format_paper_data(p) for p in papers]}
+        {'papers': [format_paper_data(p, fields) for p in papers], 'next_cursor': next_cursor}
     )
 
+
 @papers_bp.route('/<int:paper_id>/categories', methods=['GET'])
 @jwt_required()
 def get_paper_categories(paper_id):
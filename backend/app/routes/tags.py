@@ -9,6 +9,7 @@ from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.highlights_and_tags import Tags
+from app.utils.versions import conditional
 from app.utils.papers import (
     create_success_response,
     create_error_response,
@@ -52,6 +53,7 @@ def create_tag():
 
 @tags_bp.route('/api/tags', methods=['GET'])
 @jwt_required()
+@conditional
 def get_tags():
     """Get all tags"""
     tags = Tags.query.all()
@@ -0,0 +1,37 @@
+# app/search/__init__.py
+"""
+Search subsystem behind /api/search-all.
+Importing this package registers the index maintenance events and the
+full-text DDL hooks on the paper and paper_page tables.
+"""
+from .index import find_candidates, reindex_user
+from .backends import SearchBackend, IndexBackend
+from .fulltext import PostgresFullTextBackend, SqliteFullTextBackend
+from .pages import find_text_matches
+from .ranking import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .suggest import suggest, get_suggestion_cache
+from .related import related_papers, get_related_cache
+from .cache import get_result_cache
+from .engine import create_backend, get_backend, search_library, cached_search
+
+__all__ = [
+    'find_candidates',
+    'reindex_user',
+    'SearchBackend',
+    'IndexBackend',
+    'PostgresFullTextBackend',
+    'SqliteFullTextBackend',
+    'find_text_matches',
+    'InvalidCursor',
+    'DEFAULT_PAGE_SIZE',
+    'MAX_PAGE_SIZE',
+    'suggest',
+    'get_suggestion_cache',
+    'related_papers',
+    'get_related_cache',
+    'get_result_cache',
+    'create_backend',
+    'get_backend',
+    'search_library',
+    'cached_search'
+]
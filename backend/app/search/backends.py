@@ -0,0 +1,173 @@
+# app/search/backends.py
+"""
+Pluggable search backends.
+Every backend answers search(user_id, query) with scored result dicts, one
+shape per document type (see the *_result builders below), e.g.
+    {"type": "paper", "id", "title", "authors", "score"}
+    {"type": "highlight", "id", "paper_id", "offset", "snippet", "score"}
+`query` is expected to be stripped and lower-cased already.
+"""
+import numpy as np
+from sqlalchemy import select
+from app.extensions import db
+from app.models.paper import Paper
+from app.models.category import Category
+from app.models.note import Note
+from app.models.highlights_and_tags import Highlights
+from app.models.stickynotes import StickyNote
+
+from app.search.index import find_candidates
+from app.search.scoring import score_choices, top_k_indices
+
+MATCH_THRESHOLD = 70
+DEFAULT_TOP_K = 500
+SNIPPET_WIDTH = 160
+
+
+def make_snippet(text, query, width=SNIPPET_WIDTH):
+    """A window of the text around the first occurrence of the query (or its first word)"""
+    text = text or ""
+    if len(text) <= width:
+        return text
+
+    lowered = text.lower()
+    position = lowered.find(query)
+    if position < 0 and query.split():
+        position = lowered.find(query.split()[0])
+    start = max(0, min(position - width // 4, len(text) - width)) if position >= 0 else 0
+
+    snippet = text[start:start + width].strip()
+    if start > 0:
+        snippet = '…' + snippet
+    if start + width < len(text):
+        snippet = snippet + '…'
+    return snippet
+
+
+# ============= RESULT BUILDERS =============
+
+def paper_result(paper, query=None):
+    return {
+        "type": "paper",
+        "id": paper.id,
+        "title": paper.title,
+        "authors": paper.authors
+    }
+
+
+def category_result(category, query=None):
+    return {
+        "type": "category",
+        "id": category.id,
+        "name": category.name
+    }
+
+
+def note_result(note, query=""):
+    return {
+        "type": "note",
+        "id": note.id,
+        "paper_id": note.paper_id,
+        "snippet": make_snippet(note.content, query)
+    }
+
+
+def highlight_result(highlight, query=""):
+    return {
+        "type": "highlight",
+        "id": highlight.id,
+        "paper_id": highlight.paper_id,
+        "offset": highlight.start_offset,
+        "snippet": make_snippet(highlight.text_content, query)
+    }
+
+
+def sticky_note_result(note, query=""):
+    return {
+        "type": "sticky_note",
+        "id": note.id,
+        "paper_id": note.paper_id,
+        "snippet": make_snippet(note.content, query)
+    }
+
+
+# doc_type -> (model, columns to fetch, fields to score, result builder)
+# doc_types and scored fields match INDEXED_MODELS in app/search/index.py
+SOURCES = {
+    'paper': (Paper, (Paper.id, Paper.title, Paper.authors), ('title', 'authors'), paper_result),
+    'category': (Category, (Category.id, Category.name), ('name',), category_result),
+    'note': (Note, (Note.id, Note.paper_id, Note.content), ('content',), note_result),
+    'highlight': (Highlights, (Highlights.id, Highlights.paper_id, Highlights.start_offset,
+                               Highlights.text_content), ('text_content',), highlight_result),
+    'sticky_note': (StickyNote, (StickyNote.id, StickyNote.paper_id, StickyNote.content),
+                    ('content',), sticky_note_result),
+}
+
+# Sources still scanned when the query is too short for a trigram short list.
+# Annotation bodies are long and numerous, so they need at least one trigram.
+SCAN_SOURCES = ('paper', 'category')
+
+
+class SearchBackend:
+    """Base class; subclasses implement search()"""
+    name = None
+
+    def __init__(self, top_k=DEFAULT_TOP_K):
+        self.top_k = top_k
+
+    def search(self, user_id, query):
+        raise NotImplementedError
+
+
+class IndexBackend(SearchBackend):
+    """
+    Trigram index lookup (app/search/index.py), then one batched fuzzy
+    scoring pass (app/search/scoring.py) over the short list of every
+    document type.
+    """
+    name = 'index'
+
+    @staticmethod
+    def _fetch(columns, model, user_id, ids):
+        """Narrow column rows of the user, restricted to candidate ids (None = all)"""
+        if ids is not None and not ids:
+            return []
+        query = select(*columns).where(model.user_id == user_id)
+        if ids is not None:
+            query = query.where(model.id.in_(ids))
+        return db.session.execute(query).all()
+
+    def search(self, user_id, query):
+        candidates = find_candidates(user_id, query)
+
+        # One contiguous choice array; each source contributes one block
+        # per scored field: [titles..., authors..., category names..., ...]
+        rows, blocks, choices = [], [], []
+        for doc_type, (model, columns, fields, build) in SOURCES.items():
+            if candidates is None and doc_type not in SCAN_SOURCES:
+                continue
+            ids = None if candidates is None else candidates[doc_type]
+            source_rows = self._fetch(columns, model, user_id, ids)
+            if not source_rows:
+                continue
+            blocks.append((len(choices), len(source_rows), len(fields), build, len(rows)))
+            for field in fields:
+                choices.extend((getattr(row, field) or "").lower() for row in source_rows)
+            rows.extend(source_rows)
+
+        scores = score_choices(query, choices, MATCH_THRESHOLD)
+
+        # Best field per row, in the same order as `rows`
+        ranked = np.zeros(len(rows), dtype=np.uint8)
+        builders = [None] * len(rows)
+        for start, count, n_fields, build, row_offset in blocks:
+            block = scores[start:start + count * n_fields].reshape(n_fields, count)
+            ranked[row_offset:row_offset + count] = block.max(axis=0)
+            builders[row_offset:row_offset + count] = [build] * count
+
+        results = []
+        for i in top_k_indices(ranked, self.top_k):
+            result = builders[i](rows[i], query)
+            result['score'] = int(ranked[i])
+            results.append(result)
+        return results
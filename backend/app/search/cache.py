@@ -0,0 +1,73 @@
+# app/search/cache.py
+"""
+Bounded LRU + TTL cache of /api/search-all pages.
+Keys are (user, data version, normalized query, limit, cursor). The data
+version is the user's (user, shared) counter pair from app/utils/versions.py,
+stored in the database and incremented by every commit that changed the
+user's rows, in any process. A write therefore makes every older entry
+unreachable, so cached pages are never stale. Old entries age out through
+the LRU/TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+DEFAULT_CAPACITY = 1024
+DEFAULT_TTL = 300
+
+
+class SearchResultCache:
+    def __init__(self, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, user_id, version, query, *extra):
+        """`version` is data_version(user_id), read before searching"""
+        return (int(user_id), version, query) + extra
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'size': len(self._entries),
+            'capacity': self.capacity
+        }
+
+
+def get_result_cache():
+    """The search result cache of the current app"""
+    cache = current_app.extensions.get('search_result_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('search_result_cache', SearchResultCache(
+            capacity=current_app.config.get('SEARCH_CACHE_SIZE', DEFAULT_CAPACITY),
+            ttl=current_app.config.get('SEARCH_CACHE_TTL', DEFAULT_TTL)
+        ))
+    return cache
+
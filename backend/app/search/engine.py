@@ -0,0 +1,107 @@
+# app/search/engine.py
+"""
+Entry point of /api/search-all: picks the configured backend and runs the query.
+
+SEARCH_BACKEND (app config):
+    'index'    - trigram index + fuzzy scoring (default, typo tolerant)
+    'fulltext' - database-native full text (Postgres tsvector / SQLite FTS5)
+"""
+from flask import current_app
+from sqlalchemy.orm import load_only
+from app.extensions import db
+from app.models.paper import Paper
+
+from app.search.backends import IndexBackend, paper_result, DEFAULT_TOP_K
+from app.search.fulltext import FULLTEXT_BACKENDS
+from app.search.pages import find_text_matches
+from app.search.cache import get_result_cache
+from app.utils.versions import data_version
+from app.search.ranking import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, select_page
+
+DEFAULT_BACKEND = 'index'
+
+
+def create_backend(name, dialect, top_k=DEFAULT_TOP_K):
+    """Build a backend by config name for the given SQL dialect"""
+    if name == 'index':
+        return IndexBackend(top_k=top_k)
+    if name == 'fulltext':
+        if dialect not in FULLTEXT_BACKENDS:
+            raise ValueError(f"Full-text search is not supported on '{dialect}'")
+        return FULLTEXT_BACKENDS[dialect](top_k=top_k)
+    raise ValueError(f"Unknown SEARCH_BACKEND '{name}'")
+
+
+def get_backend():
+    """Return the backend of the current app, creating it on first use"""
+    backend = current_app.extensions.get('search_backend')
+    if backend is None:
+        backend = create_backend(
+            current_app.config.get('SEARCH_BACKEND', DEFAULT_BACKEND),
+            db.engine.dialect.name,
+            current_app.config.get('SEARCH_TOP_K', DEFAULT_TOP_K)
+        )
+        current_app.extensions['search_backend'] = backend
+    return backend
+
+
+def merge_text_matches(user_id, results, matches, limit):
+    """
+    Attach matched page numbers to paper results and append the papers
+    that only matched inside their body text or abstract, up to `limit`.
+    """
+    by_id = {r['id']: r for r in results if r['type'] == 'paper'}
+    for paper_id, match in matches.items():
+        if paper_id in by_id and match['pages']:
+            by_id[paper_id]['pages'] = match['pages']
+
+    missing = [paper_id for paper_id in matches if paper_id not in by_id]
+    missing = missing[:max(0, limit - len(results))]
+    if not missing:
+        return results
+
+    papers = Paper.query.filter(Paper.user_id == user_id, Paper.id.in_(missing))\
+        .options(load_only(Paper.id, Paper.title, Paper.authors)).all()
+    for paper in papers:
+        match = matches[paper.id]
+        result = paper_result(paper)
+        result['score'] = match['score']
+        if match['pages']:
+            result['pages'] = match['pages']
+        results.append(result)
+    return results
+
+
+def search_library(user_id, query, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Search the user's papers (title, authors, abstract, PDF text) and
+    categories with the configured backend and return one ranked page:
+        {"results": [...], "next_cursor": str | None, "total_estimate": int}
+    `query` is expected to be stripped and lower-cased already.
+    Raises InvalidCursor for a cursor that does not belong to this query.
+    """
+    after = decode_cursor(cursor, query) if cursor else None
+
+    backend = get_backend()
+    hits = backend.search(user_id, query)
+    hits = merge_text_matches(user_id, hits, find_text_matches(user_id, query), backend.top_k)
+
+    page, has_more = select_page(hits, limit, after)
+    return {
+        'results': page,
+        'next_cursor': encode_cursor(page[-1], query) if has_more else None,
+        'total_estimate': len(hits)
+    }
+
+
+def cached_search(user_id, query, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """search_library() through the per-user, version-checked result cache"""
+    cache = get_result_cache()
+    # Read before searching: a write racing with the search leaves the
+    # page under an already outdated version, where it is never served
+    key = cache.key(user_id, data_version(user_id), query, limit, cursor or '')
+    page = cache.get(key)
+    if page is None:
+        page = search_library(user_id, query, limit=limit, cursor=cursor)
+        cache.put(key, page)
+    return page
@@ -0,0 +1,197 @@
+# app/search/fulltext.py
+"""
+Database-native full-text backends.
+  - PostgreSQL: generated tsvector column on paper + GIN index, ranked with ts_rank_cd
+  - SQLite:     external-content FTS5 table kept in sync by triggers, ranked with bm25
+Matching, ranking and LIMIT all run inside the database; only the top-k rows
+come back. The DDL is attached to the paper table so db.create_all() (tests,
+fresh installs) builds it; existing databases get it from the migration.
+"""
+from rapidfuzz import fuzz
+from sqlalchemy import DDL, event, func, literal_column, select, text
+from app.extensions import db
+from app.models.paper import Paper
+from app.models.category import Category
+
+from app.search.backends import SearchBackend, MATCH_THRESHOLD, SOURCES, paper_result, category_result
+from app.search.text import normalize
+
+# ============= POSTGRESQL DDL =============
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE paper ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(authors, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(abstract, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_paper_search_vector ON paper USING GIN (search_vector)",
+]
+
+# ============= SQLITE DDL =============
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS paper_fts USING fts5(
+        title, authors, abstract,
+        content='paper', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_ai AFTER INSERT ON paper BEGIN
+        INSERT INTO paper_fts(rowid, title, authors, abstract)
+        VALUES (new.id, new.title, new.authors, new.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_ad AFTER DELETE ON paper BEGIN
+        INSERT INTO paper_fts(paper_fts, rowid, title, authors, abstract)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_au AFTER UPDATE OF title, authors, abstract ON paper BEGIN
+        INSERT INTO paper_fts(paper_fts, rowid, title, authors, abstract)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract);
+        INSERT INTO paper_fts(rowid, title, authors, abstract)
+        VALUES (new.id, new.title, new.authors, new.abstract);
+    END
+    """,
+]
+
+SQLITE_DROP_DDL = "DROP TABLE IF EXISTS paper_fts"
+
+for _statement in POSTGRES_DDL:
+    event.listen(Paper.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in SQLITE_DDL:
+    event.listen(Paper.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(Paper.__table__, 'after_drop', DDL(SQLITE_DROP_DDL).execute_if(dialect='sqlite'))
+
+
+# ============= BACKENDS =============
+
+ANNOTATION_TYPES = ('note', 'highlight', 'sticky_note')
+
+def relative_scores(ranks):
+    """
+    Map database ranks (best first) onto 1-100 relative to the best hit.
+    Works for both ts_rank_cd (higher is better) and bm25 (more negative is better).
+    """
+    if not ranks:
+        return []
+    best = ranks[0]
+    if not best:
+        return [MATCH_THRESHOLD] * len(ranks)
+    return [max(1, min(100, round(100 * rank / best))) for rank in ranks]
+
+
+class FullTextBackend(SearchBackend):
+    """Shared parts of the database-native backends"""
+
+    def search(self, user_id, query):
+        terms = normalize(query).split()
+        if not terms:
+            return []
+
+        results = []
+        rows = self.search_papers(user_id, terms)
+        for row, score in zip(rows, relative_scores([row.rank for row in rows])):
+            result = paper_result(row)
+            result['score'] = score
+            results.append(result)
+
+        for row in self.search_categories(user_id, query):
+            result = category_result(row)
+            result['score'] = max(MATCH_THRESHOLD, round(fuzz.ratio(query, row.name.lower())))
+            results.append(result)
+
+        results.extend(self.search_annotations(user_id, query))
+        return results
+
+    def search_papers(self, user_id, terms):
+        raise NotImplementedError
+
+    def search_categories(self, user_id, query):
+        """Category names are short; a substring match in SQL is enough"""
+        return db.session.execute(
+            select(Category.id, Category.name)
+            .where(Category.user_id == user_id,
+                   Category.name.icontains(query, autoescape=True))
+            .order_by(Category.name)
+            .limit(self.top_k)
+        ).all()
+
+
+    def search_annotations(self, user_id, query):
+        """Notes, highlights and sticky notes: substring match in SQL, scored on the way out"""
+        results = []
+        for doc_type in ANNOTATION_TYPES:
+            model, columns, (field,), build = SOURCES[doc_type]
+            rows = db.session.execute(
+                select(*columns)
+                .where(model.user_id == user_id,
+                       getattr(model, field).icontains(query, autoescape=True))
+                .limit(self.top_k)
+            ).all()
+            for row in rows:
+                result = build(row, query)
+                result['score'] = max(MATCH_THRESHOLD,
+                                      round(fuzz.partial_ratio(query, getattr(row, field).lower())))
+                results.append(result)
+        return results
+
+
+class PostgresFullTextBackend(FullTextBackend):
+    name = 'postgresql'
+
+    @staticmethod
+    def build_query(terms):
+        """Prefix-match every term: 'deep:* & learn:*'"""
+        return ' & '.join(f"{term}:*" for term in terms)
+
+    def search_papers(self, user_id, terms):
+        tsquery = func.to_tsquery('english', self.build_query(terms))
+        vector = literal_column('paper.search_vector')
+        rank = func.ts_rank_cd(vector, tsquery).label('rank')
+        return db.session.execute(
+            select(Paper.id, Paper.title, Paper.authors, rank)
+            .where(Paper.user_id == user_id, vector.op('@@')(tsquery))
+            .order_by(rank.desc(), Paper.id.desc())
+            .limit(self.top_k)
+        ).all()
+
+
+class SqliteFullTextBackend(FullTextBackend):
+    name = 'sqlite'
+
+    # bm25 column weights: title, authors, abstract
+    SEARCH_SQL = text("""
+        SELECT paper.id, paper.title, paper.authors,
+               bm25(paper_fts, 10.0, 5.0, 1.0) AS rank
+        FROM paper_fts
+        JOIN paper ON paper.id = paper_fts.rowid
+        WHERE paper_fts MATCH :match AND paper.user_id = :user_id
+        ORDER BY rank
+        LIMIT :limit
+    """)
+
+    @staticmethod
+    def build_query(terms):
+        """Prefix-match every term: '"deep"* AND "learn"*'"""
+        return ' AND '.join(f'"{term}"*' for term in terms)
+
+    def search_papers(self, user_id, terms):
+        return db.session.execute(self.SEARCH_SQL, {
+            'match': self.build_query(terms),
+            'user_id': user_id,
+            'limit': self.top_k
+        }).all()
+
+
+FULLTEXT_BACKENDS = {
+    'postgresql': PostgresFullTextBackend,
+    'sqlite': SqliteFullTextBackend,
+}
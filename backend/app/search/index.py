@@ -0,0 +1,144 @@
+# app/search/index.py
+"""
+Per-user inverted index for /api/search-all.
+Papers are indexed on title + authors, categories on name, and the
+annotations (notes, highlights, sticky notes) on their text. Postings are
+written from mapper events inside the same flush as the row change, so the
+index commits (or rolls back) together with the data it describes.
+"""
+import math
+from sqlalchemy import event, select, insert, delete, func
+from app.extensions import db
+from app.models.paper import Paper
+from app.models.category import Category
+from app.models.note import Note
+from app.models.highlights_and_tags import Highlights
+from app.models.stickynotes import StickyNote
+from app.models.search import SearchPosting
+
+from app.search.text import ngrams
+
+postings = SearchPosting.__table__
+
+# A document must share at least this fraction of the query's trigrams
+# to make it onto the short list that gets fuzzy-scored
+MIN_GRAM_OVERLAP = 0.25
+# Per doc_type, so many matching annotations cannot crowd out papers
+MAX_CANDIDATES = 500
+
+# doc_type -> (model, indexed attributes)
+INDEXED_MODELS = {
+    'paper': (Paper, ('title', 'authors')),
+    'category': (Category, ('name',)),
+    'note': (Note, ('content',)),
+    'highlight': (Highlights, ('text_content',)),
+    'sticky_note': (StickyNote, ('content',)),
+}
+
+
+def document_tokens(texts):
+    """Union of the trigrams of every indexed field"""
+    tokens = set()
+    for text in texts:
+        tokens |= ngrams(text)
+    return tokens
+
+
+def write_postings(connection, doc_type, doc_id, user_id, texts):
+    """Replace the postings of one document"""
+    drop_postings(connection, doc_type, doc_id)
+    tokens = document_tokens(texts)
+    if tokens:
+        connection.execute(insert(postings), [
+            {'user_id': user_id, 'token': token, 'doc_type': doc_type, 'doc_id': doc_id}
+            for token in tokens
+        ])
+
+
+def drop_postings(connection, doc_type, doc_id):
+    """Remove every posting of one document"""
+    connection.execute(
+        delete(postings).where(
+            postings.c.doc_type == doc_type,
+            postings.c.doc_id == doc_id
+        )
+    )
+
+
+def find_candidates(user_id, query):
+    """
+    Look up the documents sharing enough trigrams with the query.
+    Returns {doc_type: [ids]} ordered by overlap, at most MAX_CANDIDATES
+    per type, or None when the query is too short to produce any trigram
+    (callers then fall back to a scan).
+    """
+    grams = ngrams(query)
+    if not grams:
+        return None
+
+    min_hits = max(1, math.ceil(len(grams) * MIN_GRAM_OVERLAP))
+    hits = func.count(postings.c.token)
+    ranked = (
+        select(
+            postings.c.doc_type,
+            postings.c.doc_id,
+            func.row_number().over(
+                partition_by=postings.c.doc_type,
+                order_by=(hits.desc(), postings.c.doc_id)
+            ).label('rank')
+        )
+        .where(postings.c.user_id == user_id, postings.c.token.in_(grams))
+        .group_by(postings.c.doc_type, postings.c.doc_id)
+        .having(hits >= min_hits)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(ranked.c.doc_type, ranked.c.doc_id)
+        .where(ranked.c.rank <= MAX_CANDIDATES)
+        .order_by(ranked.c.doc_type, ranked.c.rank)
+    )
+
+    candidates = {doc_type: [] for doc_type in INDEXED_MODELS}
+    for doc_type, doc_id in rows:
+        candidates[doc_type].append(doc_id)
+    return candidates
+
+
+def reindex_user(user_id):
+    """Rebuild every posting of one user (backfill / repair). Returns doc count."""
+    connection = db.session.connection()
+    connection.execute(delete(postings).where(postings.c.user_id == user_id))
+
+    count = 0
+    for doc_type, (model, fields) in INDEXED_MODELS.items():
+        for row in model.query.filter_by(user_id=user_id).all():
+            write_postings(connection, doc_type, row.id, row.user_id,
+                           [getattr(row, field) for field in fields])
+            count += 1
+    return count
+
+
+# ============= INDEX MAINTENANCE EVENTS =============
+
+def _register_listeners(doc_type, model, fields):
+    def after_insert(mapper, connection, target):
+        write_postings(connection, doc_type, target.id, target.user_id,
+                       [getattr(target, field) for field in fields])
+
+    def after_update(mapper, connection, target):
+        state = db.inspect(target)
+        if not any(state.attrs[field].history.has_changes() for field in fields):
+            return
+        write_postings(connection, doc_type, target.id, target.user_id,
+                       [getattr(target, field) for field in fields])
+
+    def after_delete(mapper, connection, target):
+        drop_postings(connection, doc_type, target.id)
+
+    event.listen(model, 'after_insert', after_insert)
+    event.listen(model, 'after_update', after_update)
+    event.listen(model, 'after_delete', after_delete)
+
+
+for _doc_type, (_model, _fields) in INDEXED_MODELS.items():
+    _register_listeners(_doc_type, _model, _fields)
@@ -0,0 +1,146 @@
+# app/search/pages.py
+"""
+Full-text index over the PDF body text (PaperPage) and paper abstracts.
+  - SQLite:     contentless FTS5 table paper_page_fts (rowid = paper_page.id);
+                the compressed page row stays the only copy of the text
+  - PostgreSQL: paper_page.search_vector tsvector + GIN index
+Abstracts are matched through the paper-level structures from fulltext.py.
+Nothing here ever re-opens a PDF.
+"""
+from sqlalchemy import DDL, event, text
+from app.extensions import db
+from app.models.paper_page import PaperPage
+
+from app.search.fulltext import PostgresFullTextBackend, SqliteFullTextBackend
+from app.search.text import normalize
+
+MAX_PAGE_HITS = 200
+
+# Text-only matches rank below any title/author/category match (>= 70)
+ABSTRACT_MATCH_SCORE = 65
+BODY_MATCH_SCORE = 60
+
+# ============= DDL =============
+
+POSTGRES_DDL = [
+    "ALTER TABLE paper_page ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_paper_page_search_vector ON paper_page USING GIN (search_vector)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS paper_page_fts USING fts5(
+        body, content='', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+SQLITE_DROP_DDL = "DROP TABLE IF EXISTS paper_page_fts"
+
+for _statement in POSTGRES_DDL:
+    event.listen(PaperPage.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in SQLITE_DDL:
+    event.listen(PaperPage.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(PaperPage.__table__, 'after_drop', DDL(SQLITE_DROP_DDL).execute_if(dialect='sqlite'))
+
+
+# ============= INDEX MAINTENANCE EVENTS =============
+# Pages are write-once: they are only ever inserted with their paper
+# and deleted with it, so there is no update listener.
+
+@event.listens_for(PaperPage, 'after_insert')
+def index_page(mapper, connection, target):
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        connection.execute(
+            text("INSERT INTO paper_page_fts(rowid, body) VALUES (:id, :body)"),
+            {'id': target.id, 'body': target.text}
+        )
+    elif dialect == 'postgresql':
+        connection.execute(
+            text("UPDATE paper_page SET search_vector = to_tsvector('english', :body) WHERE id = :id"),
+            {'id': target.id, 'body': target.text}
+        )
+
+
+@event.listens_for(PaperPage, 'after_delete')
+def unindex_page(mapper, connection, target):
+    # Contentless FTS5 needs the original text to remove a row
+    if connection.dialect.name == 'sqlite':
+        connection.execute(
+            text("INSERT INTO paper_page_fts(paper_page_fts, rowid, body) VALUES ('delete', :id, :body)"),
+            {'id': target.id, 'body': target.text}
+        )
+
+
+# ============= QUERIES =============
+
+SQLITE_PAGES_SQL = text("""
+    SELECT paper_page.paper_id, paper_page.page_number
+    FROM paper_page_fts
+    JOIN paper_page ON paper_page.id = paper_page_fts.rowid
+    JOIN paper ON paper.id = paper_page.paper_id
+    WHERE paper_page_fts MATCH :match AND paper.user_id = :user_id
+    ORDER BY bm25(paper_page_fts)
+    LIMIT :limit
+""")
+
+SQLITE_ABSTRACTS_SQL = text("""
+    SELECT paper.id
+    FROM paper_fts
+    JOIN paper ON paper.id = paper_fts.rowid
+    WHERE paper_fts MATCH 'abstract : (' || :match || ')' AND paper.user_id = :user_id
+    ORDER BY bm25(paper_fts, 10.0, 5.0, 1.0)
+    LIMIT :limit
+""")
+
+POSTGRES_PAGES_SQL = text("""
+    SELECT paper_page.paper_id, paper_page.page_number
+    FROM paper_page
+    JOIN paper ON paper.id = paper_page.paper_id
+    WHERE paper_page.search_vector @@ to_tsquery('english', :match) AND paper.user_id = :user_id
+    ORDER BY ts_rank_cd(paper_page.search_vector, to_tsquery('english', :match)) DESC
+    LIMIT :limit
+""")
+
+POSTGRES_ABSTRACTS_SQL = text("""
+    SELECT paper.id
+    FROM paper
+    WHERE paper.search_vector @@ to_tsquery('english', :match)
+      AND ts_filter(paper.search_vector, '{c}') @@ to_tsquery('english', :match)
+      AND paper.user_id = :user_id
+    ORDER BY ts_rank_cd(paper.search_vector, to_tsquery('english', :match)) DESC
+    LIMIT :limit
+""")
+
+# dialect -> (query builder, page query, abstract query)
+TEXT_QUERIES = {
+    'sqlite': (SqliteFullTextBackend.build_query, SQLITE_PAGES_SQL, SQLITE_ABSTRACTS_SQL),
+    'postgresql': (PostgresFullTextBackend.build_query, POSTGRES_PAGES_SQL, POSTGRES_ABSTRACTS_SQL),
+}
+
+
+def find_text_matches(user_id, query, limit=MAX_PAGE_HITS):
+    """
+    Match the query against page text and abstracts.
+    Returns {paper_id: {"score", "pages"}}; papers matched only through
+    their abstract have no pages.
+    """
+    terms = normalize(query).split()
+    dialect = db.engine.dialect.name
+    if not terms or dialect not in TEXT_QUERIES:
+        return {}
+
+    build_query, pages_sql, abstracts_sql = TEXT_QUERIES[dialect]
+    params = {'match': build_query(terms), 'user_id': user_id, 'limit': limit}
+
+    matches = {}
+    for paper_id, page_number in db.session.execute(pages_sql, params):
+        match = matches.setdefault(paper_id, {'score': BODY_MATCH_SCORE, 'pages': []})
+        match['pages'].append(page_number)
+    for match in matches.values():
+        match['pages'].sort()
+    for (paper_id,) in db.session.execute(abstracts_sql, params):
+        match = matches.setdefault(paper_id, {'score': ABSTRACT_MATCH_SCORE, 'pages': []})
+        match['score'] = ABSTRACT_MATCH_SCORE
+    return matches
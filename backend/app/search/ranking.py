@@ -0,0 +1,54 @@
+# app/search/ranking.py
+"""
+Ranking and cursor pagination of search hits.
+Hits are ordered by (score desc, type, id). A page is chosen with a bounded
+heap of limit + 1 entries, so no full sort of the match list ever happens.
+Cursors are opaque to clients: base64 JSON of the last key on the page plus
+a fingerprint of the query they belong to.
+"""
+import base64
+import hashlib
+import heapq
+import json
+from app.utils.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+TYPE_ORDER = {'paper': 0, 'category': 1, 'note': 2, 'highlight': 3, 'sticky_note': 4}
+
+
+def rank_key(hit):
+    """Sort key: best score first, then by document type (papers first), then id"""
+    return (-hit['score'], TYPE_ORDER.get(hit['type'], len(TYPE_ORDER)), hit['id'])
+
+
+def _fingerprint(query):
+    return hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(hit, query):
+    """Opaque cursor pointing just after `hit`"""
+    payload = json.dumps([list(rank_key(hit)), _fingerprint(query)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, query):
+    """Return the key encoded in the cursor, or raise InvalidCursor if it is not ours"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, fingerprint = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key = tuple(int(part) for part in key)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if len(key) != 3 or fingerprint != _fingerprint(query):
+        raise InvalidCursor('Cursor does not belong to this query')
+    return key
+
+
+def select_page(hits, limit, after=None):
+    """
+    The `limit` best hits ranked strictly after the `after` key, plus a flag
+    telling whether more hits follow.
+    """
+    if after is not None:
+        hits = (hit for hit in hits if rank_key(hit) > after)
+    page = heapq.nsmallest(limit + 1, hits, key=rank_key)
+    return page[:limit], len(page) > limit
@@ -0,0 +1,251 @@
+# app/search/related.py
+"""
+Local "papers like this one" engine for /api/papers/<id>/related.
+
+Each paper becomes a sublinear TF-IDF vector over its title (weighted),
+abstract and extracted PDF text, folded into DIMENSIONS buckets with signed
+feature hashing and L2-normalised. A user's vectors form one float32 matrix,
+so related() is a single matrix-vector product plus a top-k.
+
+Matrices are kept per user in a process-local LRU (one per app), tagged
+with the user's data_version. A paper's title, abstract and pages are only
+written when it is uploaded, so once the version has moved the changes are
+the ids added or removed since: those alone are (re)vectorised or dropped,
+whichever worker wrote them. Other writes (read toggles, categories, notes)
+cost one id query and leave the matrix alone. The IDF weights of existing
+rows are frozen at vectorisation time, so the whole matrix is rebuilt once
+churn since the last build would exceed REBUILD_CHURN.
+"""
+import math
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from app.extensions import db
+from app.models.paper import Paper
+from app.models.paper_page import PaperPage
+from app.utils.versions import data_version
+
+DIMENSIONS = 1024
+TITLE_WEIGHT = 3
+MAX_CACHED_USERS = 64
+REBUILD_CHURN = 0.25
+DEFAULT_RELATED = 10
+
+_TOKEN = re.compile(r'[^\W\d_]{2,}', re.UNICODE)
+
+STOP_WORDS = frozenset("""
+    a about above after again against all am an and any are as at be because been before
+    being below between both but by can did do does doing down during each few for from
+    further had has have having he her here hers him his how i if in into is it its itself
+    just me more most my no nor not now of off on once only or other our out over own same
+    she should so some such than that the their them then there these they this those
+    through to too under until up very was we were what when where which while who whom why
+    will with you your we us also may using used use via et al fig figure table
+""".split())
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stop words"""
+    return [t for t in _TOKEN.findall((text or '').lower()) if t not in STOP_WORDS]
+
+
+def document_terms(title, abstract, page_texts):
+    """Term frequencies of one paper; title terms count TITLE_WEIGHT times"""
+    counts = Counter(tokenize(abstract))
+    for text in page_texts:
+        counts.update(tokenize(text))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def _bucket(term):
+    """Stable (bucket, sign) of a term for signed feature hashing"""
+    h = zlib.crc32(term.encode('utf-8'))
+    return h % DIMENSIONS, (1.0 if h & 0x80000000 else -1.0)
+
+
+class RelatedIndex:
+    """The float32 TF-IDF matrix of one user, plus what is needed to grow it"""
+
+    def __init__(self):
+        self.ids = []
+        self.row_of = {}
+        self.matrix = np.zeros((0, DIMENSIONS), dtype=np.float32)
+        self.df = Counter()
+        self.terms_of = {}
+        self.version = None
+        self.churn = 0
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Full build: document frequencies first, then every row against them"""
+        index = cls()
+        index.ids = list(documents)
+        index.row_of = {paper_id: row for row, paper_id in enumerate(index.ids)}
+        index.terms_of = {paper_id: frozenset(counts) for paper_id, counts in documents.items()}
+        for terms in index.terms_of.values():
+            index.df.update(terms)
+        index.matrix = np.zeros((max(16, len(index.ids)), DIMENSIONS), dtype=np.float32)
+        for row, counts in enumerate(documents.values()):
+            index.matrix[row] = index.vectorize(counts)
+        return index
+
+    # ----- vectorisation -----
+
+    def idf(self, term):
+        return math.log((1 + len(self.ids)) / (1 + self.df[term])) + 1.0
+
+    def vectorize(self, counts):
+        vector = np.zeros(DIMENSIONS, dtype=np.float32)
+        for term, tf in counts.items():
+            bucket, sign = _bucket(term)
+            vector[bucket] += sign * (1.0 + math.log(tf)) * self.idf(term)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # ----- row maintenance -----
+
+    def _append(self, paper_id, counts):
+        if len(self.ids) == len(self.matrix):
+            grown = np.zeros((max(16, 2 * len(self.matrix)), DIMENSIONS), dtype=np.float32)
+            grown[:len(self.ids)] = self.matrix[:len(self.ids)]
+            self.matrix = grown
+        self.row_of[paper_id] = len(self.ids)
+        self.ids.append(paper_id)
+        self.terms_of[paper_id] = frozenset(counts)
+        self.df.update(self.terms_of[paper_id])
+        self.matrix[self.row_of[paper_id]] = self.vectorize(counts)
+
+    def _remove(self, paper_id):
+        row = self.row_of.pop(paper_id, None)
+        if row is None:
+            return
+        self.df.subtract(self.terms_of.pop(paper_id))
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last row into the hole to keep the matrix dense
+            moved = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.ids[row] = moved
+            self.row_of[moved] = row
+        self.ids.pop()
+        self.matrix[last] = 0
+
+    def apply(self, documents, removed):
+        """Fold changed documents {id: term counts} in and drop removed ids"""
+        for paper_id in removed:
+            self._remove(paper_id)
+        for paper_id, counts in documents.items():
+            self._remove(paper_id)
+            self._append(paper_id, counts)
+        self.churn += len(documents) + len(removed)
+
+    def needs_rebuild(self, changes=0):
+        return self.churn + changes > max(8, REBUILD_CHURN * len(self.ids))
+
+    # ----- query -----
+
+    def related(self, paper_id, limit=DEFAULT_RELATED):
+        """[(paper_id, cosine)] of the most similar other papers, best first"""
+        row = self.row_of.get(paper_id)
+        if row is None or len(self.ids) < 2:
+            return []
+
+        sims = self.matrix[:len(self.ids)] @ self.matrix[row]
+        sims[row] = -1.0
+        k = min(limit, len(self.ids) - 1)
+        best = np.argpartition(-sims, k - 1)[:k]
+        best = best[np.argsort(-sims[best])]
+        return [(self.ids[i], float(sims[i])) for i in best if sims[i] > 0]
+
+
+def load_documents(user_id, paper_ids=None):
+    """{paper_id: term counts} for the user's papers (all, or only `paper_ids`)"""
+    query = select(Paper.id, Paper.title, Paper.abstract).where(Paper.user_id == user_id)
+    if paper_ids is not None:
+        query = query.where(Paper.id.in_(paper_ids))
+    papers = db.session.execute(query).all()
+    if not papers:
+        return {}
+
+    page_texts = {paper.id: [] for paper in papers}
+    pages = db.session.execute(
+        select(PaperPage.paper_id, PaperPage.content)
+        .where(PaperPage.paper_id.in_(page_texts))
+        .order_by(PaperPage.paper_id, PaperPage.page_number)
+    )
+    for paper_id, content in pages:
+        page_texts[paper_id].append(zlib.decompress(content).decode('utf-8'))
+
+    return {
+        paper.id: document_terms(paper.title, paper.abstract, page_texts[paper.id])
+        for paper in papers
+    }
+
+
+class RelatedCache:
+    """Process-local LRU of RelatedIndex per user"""
+
+    def __init__(self, capacity=MAX_CACHED_USERS):
+        self.capacity = capacity
+        self._indexes = OrderedDict()
+        self._user_locks = {}
+        # Guards the dicts above; held only briefly
+        self._lock = threading.Lock()
+
+    def _user_lock(self, user_id):
+        with self._lock:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    def get(self, user_id):
+        """The user's index, brought up to date with the committed papers"""
+        user_id = int(user_id)
+        # Indexes are mutated in place, so lookups of one user are serialised;
+        # a long rebuild for one user does not hold up anyone else
+        with self._user_lock(user_id):
+            # Read before the papers: a write landing meanwhile leaves the
+            # index under an outdated version, so it is diffed again next time
+            version = data_version(user_id)[0]
+            with self._lock:
+                index = self._indexes.get(user_id)
+
+            if index is None:
+                index = RelatedIndex.from_documents(load_documents(user_id))
+            elif index.version != version:
+                current = set(db.session.scalars(select(Paper.id).where(Paper.user_id == user_id)))
+                added = current - index.row_of.keys()
+                removed = index.row_of.keys() - current
+                if index.needs_rebuild(len(added) + len(removed)):
+                    index = RelatedIndex.from_documents(load_documents(user_id))
+                elif added or removed:
+                    index.apply(load_documents(user_id, added) if added else {}, removed)
+            index.version = version
+
+            with self._lock:
+                self._indexes[user_id] = index
+                self._indexes.move_to_end(user_id)
+                while len(self._indexes) > self.capacity:
+                    self._indexes.popitem(last=False)
+            return index
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+def get_related_cache():
+    """The related-papers cache of the current app"""
+    cache = current_app.extensions.get('related_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('related_cache', RelatedCache())
+    return cache
+
+
+def related_papers(user_id, paper_id, limit=DEFAULT_RELATED):
+    """[(paper_id, cosine)] of the papers most similar to `paper_id`"""
+    return get_related_cache().get(user_id).related(paper_id, limit)
@@ -0,0 +1,40 @@
+# app/search/scoring.py
+"""
+Batched fuzzy scoring: one rapidfuzz.process.cdist call per query over a
+contiguous array of choices, instead of a Python-level partial_ratio per row.
+"""
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Below this many choices the thread pool costs more than it saves
+PARALLEL_MIN_CHOICES = 2000
+
+
+def score_choices(query, choices, score_cutoff):
+    """
+    partial_ratio of the query against every choice, as a uint8 array
+    aligned with `choices`. Scores under the cutoff come back as 0.
+    """
+    if not choices:
+        return np.zeros(0, dtype=np.uint8)
+
+    workers = -1 if len(choices) >= PARALLEL_MIN_CHOICES else 1
+    return process.cdist(
+        [query], choices,
+        scorer=fuzz.partial_ratio,
+        score_cutoff=score_cutoff,
+        workers=workers,
+        dtype=np.uint8
+    )[0]
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest non-zero scores, best first (ties keep input order)"""
+    hits = np.flatnonzero(scores)
+    if len(hits) > k:
+        # Ties at the cut are kept in input order too, not dropped at random
+        kth = np.partition(scores[hits], -k)[-k]
+        above = hits[scores[hits] > kth]
+        tied = hits[scores[hits] == kth][:k - len(above)]
+        hits = np.sort(np.concatenate((above, tied)))
+    return hits[np.argsort(-scores[hits].astype(np.int16), kind='stable')]
@@ -0,0 +1,167 @@
+# app/search/suggest.py
+"""
+Search-as-you-type completion for /api/search/suggest.
+Each user gets a sorted array of completion entry points built lazily from
+titles, author surnames, tag names and category names; lookups are a
+binary search plus a short forward scan. An entry point is a (source, offset)
+pair into the normalized source text, so a title's word-start suffixes
+share its one string instead of being copied. Arrays live in a process-local LRU (one
+per app), tagged with the user's data version (app/utils/versions.py) read
+before they were built; once any process commits a write to the user's
+rows the version moves on and the array is rebuilt on next use.
+"""
+import re
+import threading
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import select
+from app.extensions import db
+from app.models.paper import Paper
+from app.models.category import Category
+from app.models.highlights_and_tags import Tags, paper_tags
+from app.utils.versions import data_version
+
+from app.search.text import normalize
+
+MAX_CACHED_USERS = 256
+DEFAULT_SUGGESTIONS = 10
+
+_AUTHOR_SPLIT = re.compile(r'\s*(?:,|;|\band\b|&)\s*', re.IGNORECASE)
+_WORD_START = re.compile(r'(?<!\S)\S')
+
+
+def author_surnames(authors):
+    """'John Doe, Jane Smith' -> ['Doe', 'Smith']"""
+    surnames = []
+    for author in _AUTHOR_SPLIT.split(authors or ''):
+        parts = author.split()
+        if parts:
+            surnames.append(parts[-1].strip('.'))
+    return surnames
+
+
+class SuggestionIndex:
+    """
+    Immutable index of one user: distinct (term, kind, text) sources, plus
+    (source, offset) entry points sorted by the term suffix they start
+    """
+
+    def __init__(self, sources):
+        self.sources = sorted(set(sources))
+        entries = []
+        for source, (term, kind, _) in enumerate(self.sources):
+            if kind == 'title':
+                # Every word start of a title is a completion entry point
+                entries.extend((source, match.start()) for match in _WORD_START.finditer(term))
+            else:
+                entries.append((source, 0))
+        entries.sort(key=lambda entry: (self.sources[entry[0]][0][entry[1]:], entry[0]))
+        self.entries = entries
+
+    def _term(self, entry, length):
+        """The first `length` characters of an entry point's term"""
+        source, offset = entry
+        return self.sources[source][0][offset:offset + length]
+
+    @classmethod
+    def build(cls, user_id):
+        sources = []
+
+        papers = db.session.execute(
+            select(Paper.title, Paper.authors).where(Paper.user_id == user_id)
+        ).all()
+        for title, authors in papers:
+            sources.append((normalize(title), 'title', title))
+            for surname in author_surnames(authors):
+                sources.append((normalize(surname), 'author', surname))
+
+        categories = db.session.execute(
+            select(Category.name).where(Category.user_id == user_id)
+        ).scalars()
+        sources.extend((normalize(name), 'category', name) for name in categories)
+
+        tags = db.session.execute(
+            select(Tags.name).distinct()
+            .join(paper_tags, paper_tags.c.tag_id == Tags.id)
+            .join(Paper, Paper.id == paper_tags.c.paper_id)
+            .where(Paper.user_id == user_id)
+        ).scalars()
+        sources.extend((normalize(name), 'tag', name) for name in tags)
+
+        return cls(source for source in sources if source[0])
+
+    def complete(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        """Up to `limit` distinct suggestions whose term starts with the prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        # Entries are sorted by term, so also by each term's first len(prefix) characters
+        length = len(prefix)
+        lo, hi = 0, len(self.entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(self.entries[mid], length) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        suggestions = []
+        seen = set()
+        i = lo
+        while i < len(self.entries) and self._term(self.entries[i], length) == prefix:
+            _, kind, text = self.sources[self.entries[i][0]]
+            if (kind, text) not in seen:
+                seen.add((kind, text))
+                suggestions.append({'text': text, 'type': kind})
+                if len(suggestions) >= limit:
+                    break
+            i += 1
+        return suggestions
+
+
+class SuggestionCache:
+    """Process-local LRU of SuggestionIndex per user"""
+
+    def __init__(self, capacity=MAX_CACHED_USERS):
+        self.capacity = capacity
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = int(user_id)
+        # Read before building: a write landing during the build leaves the
+        # index under an already outdated version, where it is never served
+        version = data_version(user_id)
+        with self._lock:
+            cached = self._indexes.get(user_id)
+            if cached is not None and cached[0] == version:
+                self._indexes.move_to_end(user_id)
+                return cached[1]
+
+        index = SuggestionIndex.build(user_id)
+        with self._lock:
+            cached = self._indexes.get(user_id)
+            # A concurrent build may already have stored a newer index
+            if cached is None or cached[0] <= version:
+                self._indexes[user_id] = (version, index)
+                self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.capacity:
+                self._indexes.popitem(last=False)
+        return index
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+def get_suggestion_cache():
+    """The suggestion cache of the current app"""
+    cache = current_app.extensions.get('suggestion_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('suggestion_cache', SuggestionCache())
+    return cache
+
+
+def suggest(user_id, prefix, limit=DEFAULT_SUGGESTIONS):
+    """Completions for the prefix from the user's (cached) suggestion index"""
+    return get_suggestion_cache().get(user_id).complete(prefix, limit)
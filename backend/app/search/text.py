@@ -0,0 +1,23 @@
+# app/search/text.py
+"""
+Text normalization shared by the search index and the query path.
+Both sides MUST go through the same functions or postings will not line up.
+"""
+import re
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+GRAM_SIZE = 3
+
+
+def normalize(text):
+    """Lower-case text and collapse punctuation/whitespace runs to one space"""
+    return _NON_WORD.sub(' ', (text or '').lower()).strip()
+
+
+def ngrams(text, n=GRAM_SIZE):
+    """Return the set of character n-grams of the normalized text"""
+    text = normalize(text)
+    if len(text) < n:
+        return set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
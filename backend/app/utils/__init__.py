@@ -5,7 +5,9 @@ from .category_utils import (normalize_parent_id,
                             validate_color_format,
                             validate_icon_format,
                             collect_descendant_ids,
+                            descendant_depths,
                             check_name_conflict,
+                            root_renames,
                             validate_parent_exists
                             )
 from .papers import (
@@ -1,4 +1,7 @@
+from sqlalchemy import select, or_
+from app.extensions import db
 from app.models.category import Category
+from app.models.category_closure import CategoryClosure
 import re
 
 def normalize_parent_id(parent_id):
@@ -26,14 +29,21 @@ def validate_icon_format(icon):
     # Basic validation for FontAwesome classes
     return bool(re.match(r'^fa-[a-zA-Z0-9-]+$', icon))
 
+def descendant_depths(category_id):
+    """
+    [(descendant id, depth)] of a category, children at depth 1, from one
+    indexed closure-table lookup. Ordered by depth, then id.
+    """
+    rows = db.session.execute(
+        select(CategoryClosure.descendant_id, CategoryClosure.depth)
+        .where(CategoryClosure.ancestor_id == category_id, CategoryClosure.depth > 0)
+        .order_by(CategoryClosure.depth, CategoryClosure.descendant_id)
+    )
+    return [(descendant_id, depth) for descendant_id, depth in rows]
+
 def collect_descendant_ids(category):
-    """Recursively collect all descendant category IDs."""
-    descendant_ids = []
-    children = Category.query.filter_by(parent_id=category.id).all()
-    for child in children:
-        descendant_ids.append(child.id)
-        descendant_ids.extend(collect_descendant_ids(child))
-    return descendant_ids
+    """All descendant category IDs, in one query."""
+    return [category_id for category_id, _ in descendant_depths(category.id)]
 
 def check_name_conflict(name, user_id, exclude_id=None, parent_id=None):
     """Check if category name conflicts with existing categories for the user"""
@@ -42,6 +52,36 @@ def check_name_conflict(name, user_id, exclude_id=None, parent_id=None):
         query = query.filter(Category.id != exclude_id)
     return query.first() is not None
 
+def root_renames(children, user_id, exclude_id=None):
+    """
+    {child id: new name} for (id, name) children about to become roots whose
+    name is taken there. Taken root names come from one query; suffixes
+    "(moved)", "(moved 2)", ... are assigned in memory.
+    """
+    names = {name for _, name in children}
+    if not names:
+        return {}
+    query = select(Category.name).where(
+        Category.user_id == user_id,
+        Category.parent_id.is_(None),
+        or_(Category.name.in_(names), Category.name.like('% (moved%)'))
+    )
+    if exclude_id:
+        query = query.where(Category.id != exclude_id)
+    taken = set(db.session.scalars(query))
+
+    renames = {}
+    for child_id, name in children:
+        if name in taken:
+            suffix = 1
+            new_name = f"{name} (moved)"
+            while new_name in taken:
+                suffix += 1
+                new_name = f"{name} (moved {suffix})"
+            renames[child_id] = name = new_name
+        taken.add(name)
+    return renames
+
 def validate_parent_exists(parent_id, user_id):
     """Validate that parent category exists and belongs to user"""
     if parent_id is None:
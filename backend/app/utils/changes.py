@@ -0,0 +1,45 @@
+# app/utils/changes.py
+"""
+Write tracking for the per-user data versions (app/utils/versions.py).
+Mapper events record whose rows changed during a flush, under the owning
+user's id, or ALL_USERS for rows shared by every user (tags). The record is
+dropped once the transaction commits or rolls back.
+
+Bulk statements (query.update/delete, Core DML) bypass mapper events:
+call mark_changed() next to them.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.models.paper import Paper
+from app.models.category import Category
+from app.models.note import Note
+from app.models.highlights_and_tags import Highlights, Tags
+from app.models.stickynotes import StickyNote
+
+ALL_USERS = '*'
+
+USER_OWNED_MODELS = (Paper, Category, Note, Highlights, StickyNote)
+SHARED_MODELS = (Tags,)
+
+
+def mark_changed(session, user_id):
+    """Record that `user_id`'s rows changed (None = rows shared by every user)"""
+    key = ALL_USERS if user_id is None else int(user_id)
+    session.info.setdefault('changed_users', set()).add(key)
+
+
+def _record(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_changed(session, getattr(target, 'user_id', None))
+
+
+for _model in USER_OWNED_MODELS + SHARED_MODELS:
+    for _event in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event, _record)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _discard(session):
+    session.info.pop('changed_users', None)
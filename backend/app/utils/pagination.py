@@ -0,0 +1,86 @@
+# app/utils/pagination.py
+"""
+Keyset (cursor) pagination for list endpoints.
+A page is fetched with `WHERE (sort, id) < (last sort, last id) ORDER BY
+sort DESC, id DESC LIMIT n + 1` (or the ascending mirror), so with an index
+on (user_id, sort, id) every page costs the same, however deep. Cursors are
+opaque base64 JSON of the last row's key plus a scope naming the listing,
+filters and sort order they belong to.
+"""
+import base64
+import datetime
+import hashlib
+import json
+from flask import request
+from sqlalchemy import DateTime, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that are malformed or belong to another listing"""
+
+
+def parse_limit(default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """The ?limit= of the current request clamped to 1..maximum; ValueError if not an int"""
+    limit = int(request.args.get('limit', default))
+    return max(1, min(limit, maximum))
+
+
+def encode_keyset_cursor(row_key, scope):
+    """Opaque cursor for a (sort value, id) key"""
+    sort_value, row_id = row_key
+    if isinstance(sort_value, datetime.datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id, scope], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(cursor, scope, sort_column=None):
+    """The (sort value, id) key in the cursor, or raise InvalidCursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id, cursor_scope = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if sort_column is None or isinstance(sort_column.type, DateTime):
+            sort_value = datetime.datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, str):
+            raise TypeError(sort_value)
+        key = (sort_value, int(row_id))
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if cursor_scope != scope:
+        raise InvalidCursor('Cursor does not belong to this listing')
+    return key
+
+
+def scope_of(name, **params):
+    """Cursor scope binding a listing to its filters and sort order"""
+    canonical = json.dumps(sorted((k, v) for k, v in params.items() if v is not None), default=str)
+    return f'{name}:{hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]}'
+
+
+def keyset_page(query, sort_column, id_column, limit, cursor=None, scope='', descending=True):
+    """
+    One page of `query` ordered by (sort_column, id_column), newest/largest
+    first unless `descending` is False.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        after = decode_keyset_cursor(cursor, scope, sort_column)
+        query = query.filter(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_keyset_cursor(
+            (getattr(last, sort_column.key), getattr(last, id_column.key)), scope
+        )
+    return rows, next_cursor
@@ -1,10 +1,16 @@
-from flask import jsonify, current_app
+from flask import jsonify, current_app, request
+import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
 from flask_jwt_extended import get_jwt_identity
 from werkzeug.utils import secure_filename
 import os
 from app.models.paper import Paper
 from app.models.note import Note
 from app.models.category import Category
+from app.models.base import paper_categories
+from app.models.highlights_and_tags import paper_tags
+from app.models.category_closure import CategoryClosure
 
 
 def create_success_response(message, data=None, status_code=200):
@@ -70,25 +76,12 @@ def save_uploaded_file(file):
         return None, create_error_response(f'Failed to save file: {str(e)}', 500)
 
 
-def format_paper_data(paper):
-    """Format paper data for API response"""
-    return {
-        'id': paper.id,
-        'title': paper.title,
-        'authors': paper.authors,
-        'abstract': paper.abstract,
-        'is_read': paper.is_read,
-        'created_at': paper.created_at.isoformat() if paper.created_at else None,
-        'categories': [{'id': cat.id, 'name': cat.name} for cat in paper.categories]
-    }
-
-
 def format_note_data(note):
     """Format note data for API response"""
     return {
         'id': note.id,
         'content': note.content,
-        'created_at': note.created_at.isoformat() if note.created_at else None
+        'created_at': note.created_at
     }
 
 
@@ -121,15 +114,120 @@ def associate_paper_with_category(paper, category_id):
     
     return False
 
-def format_paper_data(paper):
-    """Format paper data for API response"""
+def format_paper_data(paper, fields=None):
+    """Format paper data for API response, limited to `fields` if given"""
+    return paper.to_dict(fields)
+
+
+def parse_paper_fields():
+    """
+    The ?fields= sparse fieldset of the current request as a list, or None
+    when absent. Raises ValueError for unknown field names.
+    """
+    raw = request.args.get('fields', '')
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    if not fields:
+        return None
+    unknown = [f for f in fields if f not in Paper.FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown field(s): {", ".join(unknown)}. Allowed: {", ".join(Paper.FIELDS)}')
+    return fields
+
+
+def paper_projection(fields, *extra):
+    """load_only() option for the requested fields (plus `extra` columns the query needs)"""
+    columns = [getattr(Paper, f) for f in fields] + list(extra)
+    return load_only(*columns)
+
+
+# ?sort= values of paper listings: (column, descending)
+PAPER_SORTS = {
+    'newest': (Paper.upload_date, True),
+    'oldest': (Paper.upload_date, False),
+    'title': (Paper.title, False),
+    'author': (Paper.authors, False)
+}
+
+_BOOLEAN_ARGS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _int_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+
+def _datetime_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an ISO 8601 date or datetime')
+
+
+def parse_paper_filters():
+    """
+    The filter and sort arguments of a paper listing request:
+        is_read, tag_id, category_id, include_descendants,
+        uploaded_after (inclusive), uploaded_before (exclusive), sort
+    Raises ValueError for malformed values.
+    """
+    is_read = request.args.get('is_read')
+    if is_read not in (None, ''):
+        if is_read.lower() not in _BOOLEAN_ARGS:
+            raise ValueError('is_read must be true or false')
+        is_read = _BOOLEAN_ARGS[is_read.lower()]
+    else:
+        is_read = None
+
+    sort = request.args.get('sort') or 'newest'
+    if sort not in PAPER_SORTS:
+        raise ValueError(f'sort must be one of: {", ".join(PAPER_SORTS)}')
+
     return {
-        'id': paper.id,
-        'title': paper.title,
-        'authors': paper.authors,
-        'abstract': paper.abstract,
-        'file_path': paper.file_path,
-        'upload_date': paper.upload_date.isoformat() if paper.upload_date else None,
-        'is_read': paper.is_read,
-        'user_id': paper.user_id
-    }
\ No newline at end of file
+        'is_read': is_read,
+        'tag_id': _int_arg('tag_id'),
+        'category_id': _int_arg('category_id'),
+        'include_descendants': request.args.get('include_descendants', '').lower() in ('1', 'true'),
+        'uploaded_after': _datetime_arg('uploaded_after'),
+        'uploaded_before': _datetime_arg('uploaded_before'),
+        'sort': sort
+    }
+
+
+def filter_papers(query, filters, user_id):
+    """
+    Narrow a paper query with parse_paper_filters() output. Tag and category
+    filters are semi-joins through paper_tags / paper_categories, so a paper
+    in several matching categories is still returned once.
+    Raises LookupError if the category is not the user's.
+    """
+    if filters['is_read'] is not None:
+        query = query.filter(Paper.is_read == filters['is_read'])
+    if filters['uploaded_after'] is not None:
+        query = query.filter(Paper.upload_date >= filters['uploaded_after'])
+    if filters['uploaded_before'] is not None:
+        query = query.filter(Paper.upload_date < filters['uploaded_before'])
+    if filters['tag_id'] is not None:
+        query = query.filter(Paper.id.in_(
+            select(paper_tags.c.paper_id).where(paper_tags.c.tag_id == filters['tag_id'])
+        ))
+    if filters['category_id'] is not None:
+        category = Category.query.filter_by(id=filters['category_id'], user_id=user_id).first()
+        if category is None:
+            raise LookupError('Category not found')
+        if filters['include_descendants']:
+            # The subtree (the category itself is its depth-0 row) stays in SQL
+            category_ids = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category.id)
+        else:
+            category_ids = [category.id]
+        query = query.filter(Paper.id.in_(
+            select(paper_categories.c.paper_id).where(paper_categories.c.category_id.in_(category_ids))
+        ))
+    return query
@@ -0,0 +1,28 @@
+# app/utils/pdf_text.py
+"""
+PDF text-layer extraction, run once when a paper is uploaded.
+"""
+import logging
+from pypdf import PdfReader
+from app.models.paper_page import PaperPage
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pdf_pages(file_path):
+    """Return the text of every page (index 0 is page 1), or [] if unreadable"""
+    try:
+        reader = PdfReader(file_path)
+        return [page.extract_text() or '' for page in reader.pages]
+    except Exception as e:
+        logger.warning(f"Could not extract text from {file_path}: {str(e)}")
+        return []
+
+
+def build_paper_pages(file_path):
+    """Extract the PDF and wrap every non-empty page in a PaperPage"""
+    return [
+        PaperPage.from_text(number, text)
+        for number, text in enumerate(extract_pdf_pages(file_path), start=1)
+        if text.strip()
+    ]
@@ -0,0 +1,96 @@
+# app/utils/versions.py
+"""
+Per-user data versions and conditional GETs.
+Every transaction that changed a user's rows (as recorded by
+app/utils/changes.py) increments that user's data_version row before it
+commits; writes to shared rows increment the row of SHARED_VERSION_ID. The
+counters live in the database, so every worker process sees the same value.
+
+@conditional derives a weak ETag from those counters and the request URL and
+answers a matching If-None-Match with 304 before the view runs, i.e. before
+any of its queries or serialization.
+"""
+import functools
+import hashlib
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.data_version import DataVersion
+from app.utils.changes import ALL_USERS
+
+SHARED_VERSION_ID = 0
+
+_version_table = DataVersion.__table__
+
+
+def _upsert_increment(connection, user_id):
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(_version_table).values(user_id=user_id, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_version_table.c.user_id],
+            set_={'version': _version_table.c.version + 1}
+        )
+        connection.execute(stmt)
+        return
+    result = connection.execute(
+        update(_version_table).where(_version_table.c.user_id == user_id)
+        .values(version=_version_table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(_version_table).values(user_id=user_id, version=1))
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    # Flush first so rows still pending in the session are recorded too
+    session.flush()
+    changes = session.info.get('changed_users')
+    if not changes:
+        return
+    connection = session.connection()
+    for user_id in changes:
+        _upsert_increment(connection, SHARED_VERSION_ID if user_id == ALL_USERS else int(user_id))
+
+
+def data_version(user_id):
+    """(user version, shared version) as currently committed"""
+    rows = db.session.execute(
+        select(DataVersion.user_id, DataVersion.version)
+        .where(DataVersion.user_id.in_((int(user_id), SHARED_VERSION_ID)))
+    ).all()
+    versions = dict(rows)
+    return versions.get(int(user_id), 0), versions.get(SHARED_VERSION_ID, 0)
+
+
+def make_etag(user_id):
+    """ETag of the current request's representation for this user"""
+    user_version, shared_version = data_version(user_id)
+    url = hashlib.sha1(request.full_path.encode('utf-8')).hexdigest()[:12]
+    return f'{user_id}.{user_version}.{shared_version}.{url}'
+
+
+def conditional(view):
+    """
+    Answer If-None-Match with 304 when the user's data has not changed since
+    the ETag was issued. Goes below @jwt_required().
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = make_etag(get_jwt_identity())
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
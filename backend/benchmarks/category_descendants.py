@@ -0,0 +1,87 @@
+# benchmarks/category_descendants.py
+"""
+Descendant lookup on a 5k-node category tree: the old one-SELECT-per-node
+recursion, a single WITH RECURSIVE query over parent_id, and the closure
+table lookup that collect_descendant_ids() uses.
+
+    cd backend && python -m benchmarks.category_descendants [--nodes 5000] [--fanout 8]
+"""
+import argparse
+import time
+from sqlalchemy import literal, select
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.category import Category
+from app.utils.category_utils import collect_descendant_ids
+
+
+def per_node_descendants(category):
+    """The previous implementation: one query per visited node"""
+    descendant_ids = []
+    for child in Category.query.filter_by(parent_id=category.id).all():
+        descendant_ids.append(child.id)
+        descendant_ids.extend(per_node_descendants(child))
+    return descendant_ids
+
+
+def cte_descendants(category):
+    """WITH RECURSIVE over parent_id, no ancestry table"""
+    tree = select(Category.id, literal(1).label('depth'))\
+        .where(Category.parent_id == category.id)\
+        .cte('descendants', recursive=True)
+    tree = tree.union_all(select(Category.id, tree.c.depth + 1).where(Category.parent_id == tree.c.id))
+    return list(db.session.scalars(select(tree.c.id)))
+
+
+def build_tree(user_id, nodes, fanout):
+    """Breadth-first tree of `nodes` categories; returns the root"""
+    root = Category(name='root', user_id=user_id)
+    db.session.add(root)
+    db.session.flush()
+    frontier, created = [root], 1
+    while created < nodes:
+        parent = frontier.pop(0)
+        for _ in range(min(fanout, nodes - created)):
+            child = Category(name=f'c{created}', user_id=user_id, parent_id=parent.id)
+            db.session.add(child)
+            frontier.append(child)
+            created += 1
+        db.session.flush()
+    db.session.commit()
+    return root
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--nodes', type=int, default=5000)
+    parser.add_argument('--fanout', type=int, default=8)
+    args = parser.parse_args()
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'JWT_SECRET_KEY': 'bench'})
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password='x')
+        db.session.add(user)
+        db.session.commit()
+        root = build_tree(user.id, args.nodes, args.fanout)
+
+        old, old_time = timed(per_node_descendants, root)
+        cte, cte_time = timed(cte_descendants, root)
+        new, new_time = timed(collect_descendant_ids, root)
+        assert sorted(old) == sorted(cte) == sorted(new)
+
+        print(f'{len(new)} descendants, fanout {args.fanout}')
+        print(f'  per-node SELECTs  {old_time * 1000:8.1f} ms  ({len(old) + 1} queries)')
+        print(f'  WITH RECURSIVE    {cte_time * 1000:8.1f} ms  (1 query)')
+        print(f'  closure table     {new_time * 1000:8.1f} ms  (1 query)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/json_serialization.py
+"""
+Serialization of a 10k-paper listing: Flask's stdlib provider (with the old
+.isoformat() calls in to_dict) against FastJSONProvider.
+
+    cd backend && python -m benchmarks.json_serialization [--papers 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import timeit
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.paper import Paper
+from app.utils.json_provider import FastJSONProvider
+
+
+def make_papers(count):
+    base = datetime.datetime(2026, 1, 1)
+    return [
+        Paper(id=i, title=f'Paper {i} on graph neural networks', authors='Doe, J.; Smith, A.',
+              abstract='We study message passing on sparse graphs. ' * 12, is_read=i % 3 == 0,
+              file_path=f'/uploads/paper_{i}.pdf', upload_date=base + datetime.timedelta(minutes=i),
+              user_id=1)
+        for i in range(count)
+    ]
+
+
+def stdlib_payload(papers):
+    """What /api/papers built before: isoformat() done in Python per row"""
+    papers = [paper.to_dict() for paper in papers]
+    for paper in papers:
+        paper['upload_date'] = paper['upload_date'].isoformat()
+    return {'message': 'Papers retrieved successfully', 'papers': papers}
+
+
+def fast_payload(papers):
+    return {'message': 'Papers retrieved successfully', 'papers': [paper.to_dict() for paper in papers]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--papers', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    papers = make_papers(args.papers)
+    stdlib, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+
+    with app.app_context():
+        cases = {
+            'stdlib jsonify': lambda: stdlib.response(stdlib_payload(papers)).get_data(),
+            'FastJSONProvider (orjson)': lambda: fast.response(fast_payload(papers)).get_data(),
+        }
+        sizes = {name: len(run()) for name, run in cases.items()}
+        print(f'{args.papers} papers, best of {args.repeat}')
+        for name, run in cases.items():
+            best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+            print(f'  {name:<32} {best * 1000:8.1f} ms  {sizes[name] / 1024:8.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
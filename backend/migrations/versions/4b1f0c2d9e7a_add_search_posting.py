@@ -0,0 +1,34 @@
+"""Add search_posting inverted index.
+
+Revision ID: 4b1f0c2d9e7a
+Revises: 27d9b3879592
+Create Date: 2026-01-08 10:21:44.118302
+
+Run `flask search reindex` after upgrading to backfill existing rows.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1f0c2d9e7a'
+down_revision = '27d9b3879592'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('search_posting',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(length=16), nullable=False),
+    sa.Column('doc_type', sa.String(length=20), nullable=False),
+    sa.Column('doc_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'token', 'doc_type', 'doc_id')
+    )
+    op.create_index('ix_search_posting_doc', 'search_posting', ['doc_type', 'doc_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_search_posting_doc', table_name='search_posting')
+    op.drop_table('search_posting')
@@ -0,0 +1,84 @@
+"""Add database-native full-text search structures.
+
+Revision ID: 9c3e5a71f2b8
+Revises: 4b1f0c2d9e7a
+Create Date: 2026-01-12 16:04:09.552190
+
+PostgreSQL: generated tsvector column paper.search_vector + GIN index.
+SQLite:     external-content FTS5 table paper_fts + sync triggers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3e5a71f2b8'
+down_revision = '4b1f0c2d9e7a'
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE paper ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(authors, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(abstract, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_paper_search_vector ON paper USING GIN (search_vector)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS paper_fts USING fts5(
+        title, authors, abstract,
+        content='paper', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_ai AFTER INSERT ON paper BEGIN
+        INSERT INTO paper_fts(rowid, title, authors, abstract)
+        VALUES (new.id, new.title, new.authors, new.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_ad AFTER DELETE ON paper BEGIN
+        INSERT INTO paper_fts(paper_fts, rowid, title, authors, abstract)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS paper_fts_au AFTER UPDATE OF title, authors, abstract ON paper BEGIN
+        INSERT INTO paper_fts(paper_fts, rowid, title, authors, abstract)
+        VALUES ('delete', old.id, old.title, old.authors, old.abstract);
+        INSERT INTO paper_fts(rowid, title, authors, abstract)
+        VALUES (new.id, new.title, new.authors, new.abstract);
+    END
+    """,
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        # Backfill the external-content index from existing rows
+        op.execute("INSERT INTO paper_fts(paper_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_paper_search_vector")
+        op.execute("ALTER TABLE paper DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        for trigger in ('paper_fts_ai', 'paper_fts_ad', 'paper_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS paper_fts")
@@ -0,0 +1,26 @@
+"""Index paper_tags.tag_id and paper_categories.category_id for paper filters.
+
+Revision ID: a7d2f5b8c391
+Revises: f1c4d8e2a6b5
+Create Date: 2026-02-02 10:48:21.305117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2f5b8c391'
+down_revision = 'f1c4d8e2a6b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_paper_tags_tag_id', 'paper_tags', ['tag_id'], unique=False)
+    op.create_index('ix_paper_categories_category_id', 'paper_categories', ['category_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_paper_categories_category_id', table_name='paper_categories')
+    op.drop_index('ix_paper_tags_tag_id', table_name='paper_tags')
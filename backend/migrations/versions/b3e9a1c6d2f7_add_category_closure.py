@@ -0,0 +1,43 @@
+"""Add category_closure ancestry table and backfill it from parent_id.
+
+Revision ID: b3e9a1c6d2f7
+Revises: a7d2f5b8c391
+Create Date: 2026-02-05 16:20:43.118604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9a1c6d2f7'
+down_revision = 'a7d2f5b8c391'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['category.id'], ),
+    sa.ForeignKeyConstraint(['descendant_id'], ['category.id'], ),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_category_closure_descendant', 'category_closure', ['descendant_id', 'depth'], unique=False)
+    op.execute("""
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM category
+            UNION ALL
+            SELECT tree.ancestor_id, category.id, tree.depth + 1
+            FROM tree JOIN category ON category.parent_id = tree.descendant_id
+        )
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM tree
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_category_closure_descendant', table_name='category_closure')
+    op.drop_table('category_closure')
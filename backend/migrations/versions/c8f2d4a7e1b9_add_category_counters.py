@@ -0,0 +1,56 @@
+"""Add stored paper/read counters to category and backfill them.
+
+Revision ID: c8f2d4a7e1b9
+Revises: b3e9a1c6d2f7
+Create Date: 2026-02-09 11:47:15.302486
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2d4a7e1b9'
+down_revision = 'b3e9a1c6d2f7'
+branch_labels = None
+depends_on = None
+
+COUNTERS = ('paper_count', 'read_count', 'subtree_paper_count', 'subtree_read_count')
+
+
+def upgrade():
+    with op.batch_alter_table('category', schema=None) as batch_op:
+        for name in COUNTERS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE category SET
+            paper_count = (
+                SELECT COUNT(paper.id) FROM paper_categories
+                JOIN paper ON paper.id = paper_categories.paper_id
+                WHERE paper_categories.category_id = category.id
+            ),
+            read_count = (
+                SELECT COUNT(paper.id) FROM paper_categories
+                JOIN paper ON paper.id = paper_categories.paper_id
+                WHERE paper_categories.category_id = category.id AND paper.is_read
+            ),
+            subtree_paper_count = (
+                SELECT COUNT(DISTINCT paper_categories.paper_id) FROM category_closure
+                JOIN paper_categories ON paper_categories.category_id = category_closure.descendant_id
+                JOIN paper ON paper.id = paper_categories.paper_id
+                WHERE category_closure.ancestor_id = category.id
+            ),
+            subtree_read_count = (
+                SELECT COUNT(DISTINCT paper_categories.paper_id) FROM category_closure
+                JOIN paper_categories ON paper_categories.category_id = category_closure.descendant_id
+                JOIN paper ON paper.id = paper_categories.paper_id
+                WHERE category_closure.ancestor_id = category.id AND paper.is_read
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('category', schema=None) as batch_op:
+        for name in reversed(COUNTERS):
+            batch_op.drop_column(name)
@@ -0,0 +1,47 @@
+"""Add paper_page with extracted PDF text and its full-text index.
+
+Revision ID: d2a8e61c4f03
+Revises: 9c3e5a71f2b8
+Create Date: 2026-01-19 11:37:52.904116
+
+Run `flask search extract-text` after upgrading to capture existing PDFs.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a8e61c4f03'
+down_revision = '9c3e5a71f2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('paper_page',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('page_number', sa.Integer(), nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['paper_id'], ['paper.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('paper_id', 'page_number', name='uq_paper_page_number')
+    )
+    op.create_index('ix_paper_page_paper_id', 'paper_page', ['paper_id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE paper_page ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_paper_page_search_vector ON paper_page USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS paper_page_fts USING fts5("
+            "body, content='', tokenize='unicode61 remove_diacritics 2')"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS paper_page_fts")
+    op.drop_index('ix_paper_page_paper_id', table_name='paper_page')
+    op.drop_table('paper_page')
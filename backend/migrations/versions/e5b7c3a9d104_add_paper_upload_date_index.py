@@ -0,0 +1,25 @@
+"""Add (user_id, upload_date DESC, id DESC) index for paper keyset pagination.
+
+Revision ID: e5b7c3a9d104
+Revises: d2a8e61c4f03
+Create Date: 2026-01-22 09:14:06.527310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c3a9d104'
+down_revision = 'd2a8e61c4f03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_paper_user_upload_date', 'paper',
+                    ['user_id', sa.text('upload_date DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_paper_user_upload_date', table_name='paper')
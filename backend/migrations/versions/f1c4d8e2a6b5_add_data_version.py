@@ -0,0 +1,28 @@
+"""Add data_version counters for conditional GETs.
+
+Revision ID: f1c4d8e2a6b5
+Revises: e5b7c3a9d104
+Create Date: 2026-01-26 15:02:38.771904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c4d8e2a6b5'
+down_revision = 'e5b7c3a9d104'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_version',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')
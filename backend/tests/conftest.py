@@ -6,6 +6,8 @@ Contains fixtures (reusable test data) used across all test files
 import pytest
 import os
 import tempfile
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app, db, bcrypt
 from app.models.user import User
 from app.models.paper import Paper
@@ -19,9 +21,10 @@ from flask_jwt_extended import create_access_token
 # ============= APP & DATABASE FIXTURES =============
 
 @pytest.fixture(scope='function')
-def app():
+def app(tmp_path):
     """Create a Flask app for testing with in-memory SQLite"""
     app = create_app({
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'SQLALCHEMY_TRACK_MODIFICATIONS': False,
@@ -341,6 +344,75 @@ def mock_pdf_file():
     return (BytesIO(pdf_content), 'test_paper.pdf')
 
 
+def build_text_pdf(pages):
+    """
+    Build a minimal but valid PDF with one line of text per page
+    (Helvetica, no compression) so text extraction has something to read
+    """
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{pid} 0 R" for pid in page_ids), len(pages))).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for pid, text in zip(page_ids, pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append((
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>"
+        ).encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture(scope='function')
+def text_pdf_file():
+    """
+    A real two-page PDF with a text layer
+    """
+    from io import BytesIO
+
+    pdf_content = build_text_pdf([
+        'Scaled dot product attention',
+        'Results on the WMT translation benchmark'
+    ])
+    return (BytesIO(pdf_content), 'text_paper.pdf')
+
+
+
+@pytest.fixture(scope='function')
+def record_statements(app):
+    """
+    Context manager collecting the SQL of every statement the app's engine
+    runs inside the block:
+        with record_statements() as statements: ...
+    """
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def record():
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+    return record
+
 # ============= HELPER FIXTURES =============
 
 @pytest.fixture(scope='function')
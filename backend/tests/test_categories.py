@@ -5,6 +5,7 @@ Tests: Category CRUD, hierarchy, and paper associations
 """
 import pytest
 from app.models.category import Category
+from app.models.base import paper_categories
 from app.extensions import db
 
 
@@ -160,6 +161,31 @@ def test_view_all_categories_empty(client, auth_headers):
     assert response.json['total'] == 0
 
 
+def test_view_all_categories_reads_stored_counts(client, auth_headers, app, test_user, record_statements):
+    """Test paper counts and progress are read from the stored counters"""
+    from app.models.paper import Paper
+
+    with app.app_context():
+        categories = [Category(name=f'Cat {i}', user_id=test_user['id']) for i in range(20)]
+        for i, category in enumerate(categories[:3]):
+            for j in range(4):
+                db.session.add(Paper(title=f'P {i}.{j}', file_path='/fake/p.pdf', user_id=test_user['id'],
+                                     is_read=j < i, categories=[category]))
+        db.session.add_all(categories)
+        db.session.commit()
+
+    with record_statements() as statements:
+        response = client.get('/api/categories/view_all', headers=auth_headers)
+
+    counts = {c['name']: (c['paper_count'], c['progress']) for c in response.json['categories']}
+    assert counts['Cat 0'] == (4, 0)
+    assert counts['Cat 1'] == (4, 25)
+    assert counts['Cat 2'] == (4, 50)
+    assert counts['Cat 9'] == (0, 0)
+    # version lookup, categories
+    assert len(statements) == 2
+
+
 def test_view_specific_category(client, auth_headers, test_category):
     """Test viewing a specific category"""
     response = client.get(
@@ -199,6 +225,23 @@ def test_view_category_with_papers(client, auth_headers, app, test_category, tes
     assert response.json['paper_count'] == 1
 
 
+def test_view_category_sparse_fields(client, auth_headers, app, test_category, test_paper):
+    """Test ?fields= limits the category's papers to the requested keys"""
+    from app.models.paper import Paper
+
+    with app.app_context():
+        paper = db.session.get(Paper, test_paper['id'])
+        paper.categories.append(db.session.get(Category, test_category['id']))
+        db.session.commit()
+
+    response = client.get(f'/api/categories/view/{test_category["id"]}', headers=auth_headers,
+                          query_string={'fields': 'id,authors'})
+
+    assert response.status_code == 200
+    assert response.json['papers'] == [{'id': test_paper['id'], 'authors': 'John Doe, Jane Smith'}]
+    assert response.json['paper_count'] == 1
+
+
 def test_view_category_nonexistent(client, auth_headers):
     """Test viewing category that doesn't exist"""
     response = client.get(
@@ -571,4 +614,308 @@ def test_category_ordering(client, auth_headers, app, test_user):
     assert response.status_code == 200
     categories = response.json['categories']
     names = [cat['name'] for cat in categories]
-    assert names == sorted(names)
\ No newline at end of file
+    assert names == sorted(names)
+
+# ============= HIERARCHY QUERY TESTS =============
+
+def test_descendant_depths_single_query(app, test_user, record_statements):
+    """Test the closure table returns every descendant with its depth in one statement"""
+    from app.utils.category_utils import descendant_depths
+
+    with app.app_context():
+        root = Category(name='root', user_id=test_user['id'])
+        a = Category(name='a', user_id=test_user['id'], parent=root)
+        b = Category(name='b', user_id=test_user['id'], parent=root)
+        a1 = Category(name='a1', user_id=test_user['id'], parent=a)
+        a1x = Category(name='a1x', user_id=test_user['id'], parent=a1)
+        other = Category(name='other', user_id=test_user['id'])
+        db.session.add_all([root, a, b, a1, a1x, other])
+        db.session.commit()
+        root_id, ids = root.id, [c.id for c in (a, b, a1, a1x)]
+
+        with record_statements() as statements:
+            depths = descendant_depths(root_id)
+
+        assert depths == list(zip(ids, [1, 1, 2, 3]))
+        assert len(statements) == 1
+        assert descendant_depths(ids[-1]) == []
+
+
+def _closure_rows(app):
+    from app.models.category_closure import CategoryClosure
+
+    with app.app_context():
+        return {(r.ancestor_id, r.descendant_id, r.depth) for r in CategoryClosure.query.all()}
+
+
+@pytest.fixture
+def category_chain(app, test_user):
+    """root > mid > leaf, plus a separate top-level category"""
+    with app.app_context():
+        root = Category(name='root', user_id=test_user['id'])
+        mid = Category(name='mid', user_id=test_user['id'], parent=root)
+        leaf = Category(name='leaf', user_id=test_user['id'], parent=mid)
+        other = Category(name='other', user_id=test_user['id'])
+        db.session.add_all([root, mid, leaf, other])
+        db.session.commit()
+        return {c.name: c.id for c in (root, mid, leaf, other)}
+
+
+def test_closure_follows_create(app, category_chain):
+    """Test every created category gets its self row and ancestor rows"""
+    ids = category_chain
+
+    assert _closure_rows(app) == {
+        (ids['root'], ids['root'], 0), (ids['mid'], ids['mid'], 0),
+        (ids['leaf'], ids['leaf'], 0), (ids['other'], ids['other'], 0),
+        (ids['root'], ids['mid'], 1), (ids['mid'], ids['leaf'], 1), (ids['root'], ids['leaf'], 2)
+    }
+
+
+def test_closure_follows_move(client, auth_headers, app, category_chain):
+    """Test moving a subtree re-links it under the new parent"""
+    from app.models.category_closure import rebuild_closure
+
+    ids = category_chain
+    response = client.put(f'/api/categories/{ids["mid"]}/update', headers=auth_headers,
+                          json={'parent_id': ids['other']})
+
+    assert response.status_code == 200
+    rows = _closure_rows(app)
+    assert (ids['other'], ids['leaf'], 2) in rows
+    assert not any(a == ids['root'] and d != ids['root'] for a, d, _ in rows)
+    with app.app_context():
+        rebuild_closure(db.session.connection())
+        db.session.commit()
+    assert _closure_rows(app) == rows
+
+
+def test_closure_follows_delete(app, category_chain):
+    """Test deleting a leaf removes its rows"""
+    ids = category_chain
+    with app.app_context():
+        db.session.delete(db.session.get(Category, ids['leaf']))
+        db.session.commit()
+
+    assert not any(ids['leaf'] in (a, d) for a, d, _ in _closure_rows(app))
+
+
+def test_category_levels_and_ancestors(app, category_chain):
+    """Test depth and ancestry come from the closure table"""
+    ids = category_chain
+    with app.app_context():
+        leaf = db.session.get(Category, ids['leaf'])
+
+        assert leaf.get_level() == 2
+        assert leaf.get_ancestor_ids() == [ids['mid'], ids['root']]
+        assert Category.levels([ids['root'], ids['mid'], ids['other']]) == {
+            ids['root']: 0, ids['mid']: 1, ids['other']: 0
+        }
+
+
+def test_available_parents_exclude_subtree(client, auth_headers, category_chain):
+    """Test the category's own subtree is excluded and levels are reported"""
+    ids = category_chain
+    response = client.get(f'/api/categories/{ids["mid"]}/available_parents', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert {c['name']: c['level'] for c in response.json} == {'root': 0, 'other': 0}
+
+
+def test_rebuild_tree_command(runner, app, category_chain):
+    """Test the CLI recomputes the same rows"""
+    rows = _closure_rows(app)
+    with app.app_context():
+        from app.models.category_closure import CategoryClosure
+        CategoryClosure.query.delete()
+        db.session.commit()
+
+    result = runner.invoke(args=['categories', 'rebuild-tree'])
+
+    assert 'Rebuilt 7 ancestry row(s)' in result.output
+    assert _closure_rows(app) == rows
+
+
+def test_category_tree(client, auth_headers, app, category_chain, test_user, record_statements):
+    """Test the nested tree comes back in one response from a fixed number of queries"""
+    from app.models.paper import Paper
+
+    ids = category_chain
+    with app.app_context():
+        db.session.add(Paper(title='P', file_path='/fake/p.pdf', user_id=test_user['id'], is_read=True,
+                             categories=[db.session.get(Category, ids['leaf'])]))
+        db.session.commit()
+
+    with record_statements() as statements:
+        response = client.get('/api/categories/tree', headers=auth_headers)
+
+    assert response.status_code == 200
+    tree = response.json['tree']
+    assert [n['name'] for n in tree] == ['other', 'root']
+    leaf = tree[1]['children'][0]['children'][0]
+    assert (leaf['name'], leaf['paper_count'], leaf['progress'], leaf['children']) == ('leaf', 1, 100, [])
+    assert response.json['total'] == 4
+    # version lookup, categories
+    assert len(statements) == 2
+
+
+def _counters(app, ids):
+    with app.app_context():
+        return {
+            name: (c.paper_count, c.read_count, c.subtree_paper_count, c.subtree_read_count)
+            for name, c in ((name, db.session.get(Category, i)) for name, i in ids.items())
+        }
+
+
+def test_counters_follow_paper_writes(client, auth_headers, app, category_chain, test_paper):
+    """Test assigning, reading and deleting a paper updates its category and every ancestor"""
+    ids = category_chain
+    for name in ('leaf', 'mid'):
+        response = client.post(f'/api/papers/{test_paper["id"]}/categories',
+                               json={'category_id': ids[name]}, headers=auth_headers)
+        assert response.status_code == 201
+
+    # Filed twice in the subtree of root, counted once there
+    assert _counters(app, ids) == {
+        'root': (0, 0, 1, 0), 'mid': (1, 0, 1, 0), 'leaf': (1, 0, 1, 0), 'other': (0, 0, 0, 0)
+    }
+
+    client.put(f'/api/papers/{test_paper["id"]}/toggle-read', headers=auth_headers)
+    assert _counters(app, ids)['root'] == (0, 0, 1, 1)
+    assert _counters(app, ids)['leaf'] == (1, 1, 1, 1)
+
+    client.delete(f'/api/papers/{test_paper["id"]}', headers=auth_headers)
+    assert set(_counters(app, ids).values()) == {(0, 0, 0, 0)}
+
+
+def test_counters_follow_subtree_move(client, auth_headers, app, category_chain, test_paper):
+    """Test moving a subtree takes its papers from the old ancestors to the new ones"""
+    ids = category_chain
+    client.post(f'/api/papers/{test_paper["id"]}/categories', json={'category_id': ids['leaf']}, headers=auth_headers)
+
+    response = client.put(f'/api/categories/{ids["mid"]}/update', json={'parent_id': ids['other']}, headers=auth_headers)
+
+    assert response.status_code == 200
+    counters = _counters(app, ids)
+    assert counters['root'][2] == 0
+    assert counters['other'][2] == 1
+    assert response.json['category']['subtree_paper_count'] == 1
+
+
+def test_reconcile_counts_command(runner, app, category_chain, test_paper):
+    """Test the CLI repairs counters that drifted from paper_categories"""
+    ids = category_chain
+    with app.app_context():
+        db.session.execute(paper_categories.insert().values(paper_id=test_paper['id'], category_id=ids['leaf']))
+        db.session.commit()
+
+    result = runner.invoke(args=['categories', 'reconcile-counts'])
+
+    assert 'Repaired counters of 3 category(ies)' in result.output
+    assert _counters(app, ids)['root'] == (0, 0, 1, 0)
+    assert _counters(app, ids)['leaf'] == (1, 0, 1, 0)
+
+
+def test_delete_category_renames_children_in_memory(client, auth_headers, app, test_user):
+    """Test children taking a used root name get the next free "(moved N)" suffix"""
+    with app.app_context():
+        parent = Category(name='Parent', user_id=test_user['id'])
+        db.session.add_all([
+            Category(name='A', user_id=test_user['id']),
+            Category(name='A (moved)', user_id=test_user['id']),
+            Category(name='B', user_id=test_user['id']),
+            Category(name='A', user_id=test_user['id'], parent=parent),
+            Category(name='B', user_id=test_user['id'], parent=parent),
+            Category(name='C', user_id=test_user['id'], parent=parent),
+        ])
+        db.session.commit()
+        parent_id = parent.id
+
+    response = client.delete(f'/api/categories/{parent_id}/delete', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['details']['children_reassigned'] == 3
+    with app.app_context():
+        names = sorted(c.name for c in Category.query.filter_by(parent_id=None).all())
+    assert names == sorted(['A', 'A (moved)', 'A (moved 2)', 'B', 'B (moved)', 'C'])
+
+
+def test_delete_category_reindexes_renamed_children(client, auth_headers, app, test_user):
+    """Test a child renamed on its way to the root is searchable by its new name"""
+    with app.app_context():
+        parent = Category(name='Parent', user_id=test_user['id'])
+        db.session.add_all([
+            Category(name='Zebra', user_id=test_user['id']),
+            Category(name='Zebra', user_id=test_user['id'], parent=parent),
+        ])
+        db.session.commit()
+        parent_id = parent.id
+
+    client.delete(f'/api/categories/{parent_id}/delete', headers=auth_headers)
+    response = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'moved'})
+
+    assert response.status_code == 200
+    assert 'Zebra (moved)' in [r['name'] for r in response.json['results']]
+
+def test_delete_category_statements_do_not_grow(client, auth_headers, app, test_user, category_chain, record_statements):
+    """Test children and papers are handled by set-based statements, not one query each"""
+    from app.models.paper import Paper
+
+    ids = category_chain
+    with app.app_context():
+        root = db.session.get(Category, ids['root'])
+        for i in range(30):
+            db.session.add(Category(name=f'Child {i}', user_id=test_user['id'], parent=root))
+            db.session.add(Paper(title=f'P {i}', file_path='/fake/p.pdf', user_id=test_user['id'], categories=[root]))
+        db.session.commit()
+
+    with record_statements() as statements:
+        response = client.delete(f'/api/categories/{ids["root"]}/delete', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['details'] == {'category_name': 'root', 'children_reassigned': 31, 'papers_detached': 30}
+    assert len(statements) <= 12
+    # mid kept its own subtree and is now a root
+    assert (ids['mid'], ids['leaf'], 1) in _closure_rows(app)
+    assert not any(ids['root'] in row[:2] for row in _closure_rows(app))
+
+
+def test_list_category_papers_pages_through_subtree(client, auth_headers, app, category_chain, test_user):
+    """Test ?include_descendants=1 pages over the subtree, listing each paper once"""
+    from app.models.paper import Paper
+
+    ids = category_chain
+    with app.app_context():
+        root, leaf, other = (db.session.get(Category, ids[n]) for n in ('root', 'leaf', 'other'))
+        db.session.add_all([
+            Paper(title='Root only', file_path='/fake/1.pdf', user_id=test_user['id'], categories=[root]),
+            Paper(title='Root and leaf', file_path='/fake/2.pdf', user_id=test_user['id'], categories=[root, leaf]),
+            Paper(title='Leaf only', file_path='/fake/3.pdf', user_id=test_user['id'], categories=[leaf]),
+            Paper(title='Elsewhere', file_path='/fake/4.pdf', user_id=test_user['id'], categories=[other]),
+        ])
+        db.session.commit()
+
+    direct = client.get(f'/api/categories/{ids["root"]}/papers', headers=auth_headers)
+    assert sorted(p['title'] for p in direct.json['papers']) == ['Root and leaf', 'Root only']
+
+    titles, cursor = [], None
+    while True:
+        url = f'/api/categories/{ids["root"]}/papers?include_descendants=1&limit=2&sort=title'
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=auth_headers)
+        assert response.status_code == 200
+        titles += [p['title'] for p in response.json['papers']]
+        cursor = response.json['next_cursor']
+        if not cursor:
+            break
+
+    assert titles == ['Leaf only', 'Root and leaf', 'Root only']
+
+
+def test_list_category_papers_errors(client, auth_headers, second_auth_token, test_category):
+    """Test foreign categories are 404 and cursors from other listings are rejected"""
+    response = client.get(f'/api/categories/{test_category["id"]}/papers',
+                          headers={'Authorization': f'Bearer {second_auth_token}'})
+    assert response.status_code == 404
+
+    response = client.get(f'/api/categories/{test_category["id"]}/papers?cursor=bogus', headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+# tests/test_compression.py
+"""
+Tests for gzip / brotli response compression
+"""
+import gzip
+import json
+import zlib
+import brotli
+import pytest
+from flask import Response, stream_with_context
+from app.extensions import db
+
+
+@pytest.fixture
+def big_library(app, test_user):
+    """Enough papers that /api/papers is above the compression threshold"""
+    from app.models.paper import Paper
+
+    with app.app_context():
+        db.session.add_all(Paper(title=f'Paper {i}', abstract='A long abstract. ' * 20,
+                                 file_path=f'/fake/{i}.pdf', user_id=test_user['id'])
+                           for i in range(10))
+        db.session.commit()
+
+
+def test_gzip_json_response(client, auth_headers, big_library):
+    """Test JSON above the threshold is gzipped when the client accepts it"""
+    response = client.get('/api/papers', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert len(json.loads(gzip.decompress(response.data))['papers']) == 10
+
+
+def test_brotli_preferred(client, auth_headers, big_library):
+    """Test brotli wins over gzip at equal quality"""
+    response = client.get('/api/papers', headers={**auth_headers, 'Accept-Encoding': 'gzip, deflate, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert len(json.loads(brotli.decompress(response.data))['papers']) == 10
+
+
+def test_no_compression_without_accept_encoding(client, auth_headers, big_library):
+    """Test clients that do not ask for compression get identity bodies"""
+    response = client.get('/api/papers', headers={**auth_headers, 'Accept-Encoding': 'identity'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.json['papers']) == 10
+
+
+def test_small_response_not_compressed(client, auth_headers):
+    """Test bodies below COMPRESS_MIN_SIZE are sent as-is"""
+    response = client.get('/api/papers', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['papers'] == []
+
+
+def test_pdf_not_compressed(app, client):
+    """Test already-compressed types pass through"""
+    app.add_url_rule('/pdf-probe', 'pdf_probe', lambda: Response(b'%PDF' + b'0' * 4096, mimetype='application/pdf'))
+
+    response = client.get('/pdf-probe', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.startswith(b'%PDF')
+
+
+def test_streamed_response_compressed_per_chunk(app, client):
+    """Test generator responses are compressed and every chunk is decodable on arrival"""
+    def generate():
+        for i in range(3):
+            yield json.dumps({'line': i}) + '\n'
+
+    app.add_url_rule('/stream-probe', 'stream_probe',
+                     lambda: Response(stream_with_context(generate()), mimetype='application/x-ndjson'))
+
+    response = client.get('/stream-probe', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    decoder = zlib.decompressobj(31)
+    lines = [decoder.decompress(chunk) for chunk in response.response]
+    response.close()
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert b''.join(lines).decode().splitlines() == [json.dumps({'line': i}) for i in range(3)]
+    # Sync flushes: the first line is readable before the stream ends
+    assert lines[0] == b'{"line": 0}\n'
+
+
+def test_export_streams_gzip(client, auth_headers, big_library):
+    """Test the NDJSON export is compressed while streaming"""
+    response = client.get('/api/export.ndjson', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.data).decode().splitlines()) == 11
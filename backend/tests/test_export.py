@@ -0,0 +1,68 @@
+# tests/test_export.py
+"""
+Tests for the streaming library export
+"""
+import json
+from app.extensions import db
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_streams_papers_with_attachments(client, auth_headers, app, test_paper, test_category,
+                                                test_note, test_highlight, test_sticky_note, test_tag):
+    """Test each paper line carries its categories, tags and annotations"""
+    from app.models.paper import Paper
+    from app.models.category import Category
+    from app.models.highlights_and_tags import Tags
+
+    with app.app_context():
+        paper = db.session.get(Paper, test_paper['id'])
+        paper.categories.append(db.session.get(Category, test_category['id']))
+        paper.tags.append(db.session.get(Tags, test_tag['id']))
+        db.session.commit()
+
+    response = client.get('/api/export.ndjson', headers=auth_headers)
+    header, record = _lines(response)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert header['type'] == 'export'
+    assert record['type'] == 'paper'
+    assert record['id'] == test_paper['id']
+    assert record['categories'] == [{'id': test_category['id'], 'name': test_category['name']}]
+    assert [t['id'] for t in record['tags']] == [test_tag['id']]
+    assert [n['id'] for n in record['notes']] == [test_note['id']]
+    assert [h['id'] for h in record['highlights']] == [test_highlight['id']]
+    assert [s['id'] for s in record['sticky_notes']] == [test_sticky_note['id']]
+
+
+def test_export_covers_every_paper_across_batches(client, auth_headers, app, test_user, monkeypatch):
+    """Test papers beyond one yield_per batch are all exported, in id order"""
+    from app.models.paper import Paper
+    from app.routes import export
+
+    monkeypatch.setattr(export, 'EXPORT_BATCH_SIZE', 3)
+    with app.app_context():
+        db.session.add_all(Paper(title=f'Paper {i}', file_path=f'/fake/{i}.pdf', user_id=test_user['id'])
+                           for i in range(8))
+        db.session.commit()
+
+    records = _lines(client.get('/api/export.ndjson', headers=auth_headers))[1:]
+
+    assert [r['title'] for r in records] == [f'Paper {i}' for i in range(8)]
+
+
+def test_export_only_includes_own_papers(client, second_auth_token, test_paper):
+    """Test another user's export does not contain this user's papers"""
+    response = client.get('/api/export.ndjson', headers={'Authorization': f'Bearer {second_auth_token}'})
+
+    assert [r['type'] for r in _lines(response)] == ['export']
+
+
+def test_export_requires_auth(client):
+    """Test the export needs a token"""
+    response = client.get('/api/export.ndjson')
+
+    assert response.status_code == 401
@@ -2,6 +2,7 @@
 
 # ============= DASHBOARD TESTS =============
 import pytest
+from app.extensions import db
 
 def test_dashboard_success(client, auth_headers):
     """Test getting dashboard data"""
@@ -52,12 +53,37 @@ def test_dashboard_recent_papers_limit(client, auth_headers, app, test_user):
     assert len(response.json['recent_papers']) <= 5
 
 
+def test_dashboard_sparse_fields(client, auth_headers, test_paper):
+    """Test ?fields= limits the recent papers to the requested keys"""
+    response = client.get('/api/dashboard', headers=auth_headers, query_string={'fields': 'title'})
+
+    assert response.status_code == 200
+    assert response.json['recent_papers'] == [{'title': 'Test Research Paper'}]
+
+
+def test_dashboard_paper_stats(client, auth_headers, app, test_user):
+    """Test the dashboard reports library totals without listing every paper"""
+    from app.extensions import db
+    from app.models.paper import Paper
+
+    with app.app_context():
+        for i in range(7):
+            db.session.add(Paper(title=f'Paper {i}', file_path=f'/fake/{i}.pdf',
+                                 is_read=i < 3, user_id=test_user['id']))
+        db.session.commit()
+
+    response = client.get('/api/dashboard', headers=auth_headers)
+
+    assert response.json['paper_stats'] == {'total': 7, 'read': 3}
+    assert len(response.json['recent_papers']) == 5
+
+
 # ============= SEARCH TESTS =============
 
 def test_search_all_success(client, auth_headers, test_paper):
     """Test searching for papers"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': test_paper['title'][:5]}  # Search by partial title
     )
@@ -69,7 +95,7 @@ def test_search_all_success(client, auth_headers, test_paper):
 def test_search_all_missing_query(client, auth_headers):
     """Test search fails without query parameter"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers
     )
     
@@ -80,7 +106,7 @@ def test_search_all_missing_query(client, auth_headers):
 def test_search_all_empty_query(client, auth_headers):
     """Test search with empty query string"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': ''}
     )
@@ -91,7 +117,7 @@ def test_search_all_empty_query(client, auth_headers):
 def test_search_papers_by_title(client, auth_headers, test_paper):
     """Test searching papers by title"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': test_paper['title']}
     )
@@ -104,7 +130,7 @@ def test_search_papers_by_title(client, auth_headers, test_paper):
 def test_search_papers_by_author(client, auth_headers, test_paper):
     """Test searching papers by author"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': test_paper['authors'][:5]}
     )
@@ -115,7 +141,7 @@ def test_search_papers_by_author(client, auth_headers, test_paper):
 def test_search_categories(client, auth_headers, test_category):
     """Test searching categories"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': test_category['name']}
     )
@@ -126,19 +152,21 @@ def test_search_categories(client, auth_headers, test_category):
 def test_search_no_results(client, auth_headers):
     """Test search with no matching results"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': 'xyznonexistentquery123'}
     )
     
-    assert response.status_code == 404
-    assert 'message' in response.json
+    assert response.status_code == 200
+    assert response.json['results'] == []
+    assert response.json['total_estimate'] == 0
+    assert response.json['next_cursor'] is None
 
 
 def test_search_without_auth(client):
     """Test search requires authentication"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         query_string={'q': 'test'}
     )
     
@@ -148,7 +176,7 @@ def test_search_without_auth(client):
 def test_search_case_insensitive(client, auth_headers, test_paper):
     """Test search is case insensitive"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': test_paper['title'].upper()}
     )
@@ -165,10 +193,538 @@ def test_search_case_insensitive(client, auth_headers, test_paper):
 def test_search_various_queries(client, auth_headers, query):
     """Test search with different query strings"""
     response = client.get(
-        '/search-all',
+        '/api/search-all',
         headers=auth_headers,
         query_string={'q': query}
     )
     
-    # Should either find results or return 404, but not error
-    assert response.status_code in [200, 404]
\ No newline at end of file
+    # Should either find results or return an empty page, but not error
+    assert response.status_code == 200
+
+# ============= SEARCH INDEX TESTS =============
+
+def test_search_index_finds_typo(client, auth_headers, test_paper):
+    """Test the index short list still tolerates small typos"""
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'reserch paper'}
+    )
+
+    assert response.status_code == 200
+    assert test_paper['id'] in [r['id'] for r in response.json['results'] if r['type'] == 'paper']
+
+
+def test_search_index_follows_category_rename(client, auth_headers, test_category):
+    """Test renaming a category updates the index"""
+    client.put(
+        f'/api/categories/{test_category["id"]}/update',
+        headers=auth_headers,
+        json={'name': 'Quantum Chemistry'}
+    )
+
+    old = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'machine learning'})
+    new = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'quantum'})
+
+    assert old.json['results'] == []
+    assert new.status_code == 200
+    assert new.json['results'][0]['name'] == 'Quantum Chemistry'
+
+
+def test_search_index_drops_deleted_paper(client, auth_headers, app, test_paper):
+    """Test deleting a paper removes its postings"""
+    from app.models.search import SearchPosting
+
+    client.delete(f'/api/papers/{test_paper["id"]}', headers=auth_headers)
+
+    with app.app_context():
+        assert SearchPosting.query.filter_by(doc_type='paper', doc_id=test_paper['id']).count() == 0
+
+
+def test_search_index_is_per_user(client, second_auth_token, test_paper):
+    """Test one user's postings never surface for another user"""
+    response = client.get(
+        '/api/search-all',
+        headers={'Authorization': f'Bearer {second_auth_token}'},
+        query_string={'q': test_paper['title']}
+    )
+
+    assert response.json['results'] == []
+
+
+def test_search_reindex_command(runner, app, test_paper):
+    """Test the reindex CLI rebuilds postings from the tables"""
+    from app.extensions import db
+    from app.models.search import SearchPosting
+
+    with app.app_context():
+        SearchPosting.query.delete()
+        db.session.commit()
+
+    result = runner.invoke(args=['search', 'reindex'])
+
+    assert 'Indexed 1 documents' in result.output
+    with app.app_context():
+        assert SearchPosting.query.filter_by(doc_type='paper', doc_id=test_paper['id']).count() > 0
+
+
+# ============= FULL-TEXT BACKEND TESTS =============
+
+def test_search_fulltext_backend_matches_abstract(client, auth_headers, app, test_paper):
+    """Test the FTS5 backend searches the abstract inside SQLite"""
+    app.config['SEARCH_BACKEND'] = 'fulltext'
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'abstract machine'}
+    )
+
+    assert response.status_code == 200
+    assert response.json['results'][0]['id'] == test_paper['id']
+
+
+def test_search_fulltext_backend_prefix_and_categories(client, auth_headers, app, test_paper, test_category):
+    """Test prefix matching on papers and substring matching on categories"""
+    app.config['SEARCH_BACKEND'] = 'fulltext'
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'learn'}
+    )
+
+    types = {r['type'] for r in response.json['results']}
+    assert response.status_code == 200
+    assert types == {'paper', 'category'}
+
+
+def test_search_fulltext_backend_tracks_updates(client, auth_headers, app, test_paper):
+    """Test the FTS5 triggers follow deletes"""
+    app.config['SEARCH_BACKEND'] = 'fulltext'
+
+    client.delete(f'/api/papers/{test_paper["id"]}', headers=auth_headers)
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'research'}
+    )
+
+    assert response.json['results'] == []
+
+
+def test_search_unknown_backend(app):
+    """Test an unknown backend name is rejected"""
+    from app.search import create_backend
+
+    with pytest.raises(ValueError):
+        create_backend('elastic', 'sqlite')
+
+
+# ============= BATCH SCORING TESTS =============
+
+def test_search_results_ranked_by_score(client, auth_headers, app, test_user):
+    """Test the batched scorer returns best matches first, with scores"""
+    from app.extensions import db
+    from app.models.paper import Paper
+
+    with app.app_context():
+        db.session.add(Paper(title='Graph neural networks', file_path='/fake/a.pdf', user_id=test_user['id']))
+        db.session.add(Paper(title='Neural', file_path='/fake/b.pdf', user_id=test_user['id']))
+        db.session.add(Paper(title='Graph neural network survey', file_path='/fake/c.pdf', user_id=test_user['id']))
+        db.session.commit()
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'graph neural networks'}
+    )
+
+    scores = [r['score'] for r in response.json['results']]
+    assert response.status_code == 200
+    assert response.json['results'][0]['title'] == 'Graph neural networks'
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_results_capped_at_top_k(client, auth_headers, app, test_user):
+    """Test only SEARCH_TOP_K results come back"""
+    from app.extensions import db
+    from app.models.paper import Paper
+
+    app.config['SEARCH_TOP_K'] = 3
+    with app.app_context():
+        for i in range(6):
+            db.session.add(Paper(title=f'Transformer study {i}', file_path=f'/fake/{i}.pdf', user_id=test_user['id']))
+        db.session.commit()
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'transformer'}
+    )
+
+    assert len(response.json['results']) == 3
+
+
+def test_candidate_cap_is_per_type(client, auth_headers, app, test_user, test_paper):
+    """Test annotations filling the candidate cap do not push papers out of the results"""
+    from app.extensions import db
+    from app.models.note import Note
+    from app.models.paper import Paper
+    from app.search.index import MAX_CANDIDATES
+
+    with app.app_context():
+        paper = Paper(title='Transformer attention', file_path='/fake/t.pdf', user_id=test_user['id'])
+        db.session.add(paper)
+        for i in range(MAX_CANDIDATES + 100):
+            db.session.add(Note(content=f'transformer attention, reading note {i}',
+                                paper_id=test_paper['id'], user_id=test_user['id']))
+        db.session.commit()
+        paper_id = paper.id
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'transformer attention'}
+    )
+
+    assert response.json['results'][0]['type'] == 'paper'
+    assert response.json['results'][0]['id'] == paper_id
+
+
+def test_top_k_indices_orders_and_drops_zero_scores():
+    """Test the numpy top-k helper"""
+    import numpy as np
+    from app.search.scoring import top_k_indices
+
+    scores = np.array([0, 80, 95, 0, 80, 71], dtype=np.uint8)
+
+    assert list(top_k_indices(scores, 10)) == [2, 1, 4, 5]
+    assert list(top_k_indices(scores, 2)) == [2, 1]
+    assert list(top_k_indices(scores, 3)) == [2, 1, 4]
+
+
+# ============= PAGINATION TESTS =============
+
+def _add_papers(app, user_id, titles):
+    from app.extensions import db
+    from app.models.paper import Paper
+
+    with app.app_context():
+        for i, title in enumerate(titles):
+            db.session.add(Paper(title=title, file_path=f'/fake/{i}.pdf', user_id=user_id))
+        db.session.commit()
+
+
+def test_search_pages_through_results_with_cursor(client, auth_headers, app, test_user):
+    """Test walking every page with next_cursor yields each hit exactly once"""
+    _add_papers(app, test_user['id'], [f'Diffusion models part {i}' for i in range(7)])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {'q': 'diffusion models', 'limit': 3}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get('/api/search-all', headers=auth_headers, query_string=params)
+        assert response.status_code == 200
+        assert len(response.json['results']) <= 3
+        assert response.json['total_estimate'] == 7
+        seen.extend(r['id'] for r in response.json['results'])
+        cursor = response.json['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+def test_search_ranks_across_types(client, auth_headers, app, test_user, test_category):
+    """Test papers and categories are interleaved by score, not grouped by type"""
+    _add_papers(app, test_user['id'], ['Machine learning', 'Learning to rank machines at scale'])
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'machine learning'}
+    )
+
+    scores = [r['score'] for r in response.json['results']]
+    assert scores == sorted(scores, reverse=True)
+    assert {r['type'] for r in response.json['results']} == {'paper', 'category'}
+
+
+def test_search_rejects_foreign_cursor(client, auth_headers, app, test_user):
+    """Test a cursor from another query is refused"""
+    _add_papers(app, test_user['id'], ['Optimal transport', 'Optimal transport II'])
+    first = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'optimal transport', 'limit': 1}
+    )
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'transport', 'cursor': first.json['next_cursor']}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('cursor', ['garbage', 'e30', '!!!'])
+def test_search_rejects_malformed_cursor(client, auth_headers, cursor):
+    """Test malformed cursors return 400 instead of 500"""
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'anything', 'cursor': cursor}
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_rejects_non_integer_limit(client, auth_headers):
+    """Test limit must be an integer"""
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'anything', 'limit': 'ten'}
+    )
+
+    assert response.status_code == 400
+
+
+# ============= SUGGEST TESTS =============
+
+def test_suggest_completes_titles_authors_categories(client, auth_headers, test_paper, test_category):
+    """Test prefix completion over every source"""
+    title = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'test res'})
+    author = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'smi'})
+    category = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'machine'})
+
+    assert title.json['suggestions'] == [{'text': 'Test Research Paper', 'type': 'title'}]
+    assert author.json['suggestions'] == [{'text': 'Smith', 'type': 'author'}]
+    assert {'text': 'Machine Learning', 'type': 'category'} in category.json['suggestions']
+
+
+def test_suggest_matches_inner_title_words(client, auth_headers, test_paper):
+    """Test completion starts at every word of a title, not only the first"""
+    response = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'pap'})
+
+    assert response.json['suggestions'] == [{'text': 'Test Research Paper', 'type': 'title'}]
+
+
+def test_suggestion_index_points_into_titles():
+    """Test title suffixes are (source, offset) pairs into one stored title, not copies"""
+    from app.search.suggest import SuggestionIndex
+
+    index = SuggestionIndex([('graph neural networks', 'title', 'Graph Neural Networks'),
+                             ('graham', 'author', 'Graham')])
+
+    assert len(index.sources) == 2
+    assert sorted(offset for _, offset in index.entries) == [0, 0, 6, 13]
+    assert index.complete('gra') == [{'text': 'Graham', 'type': 'author'},
+                                     {'text': 'Graph Neural Networks', 'type': 'title'}]
+    assert index.complete('neural net') == [{'text': 'Graph Neural Networks', 'type': 'title'}]
+    assert index.complete('networks x') == []
+
+
+def test_suggest_includes_tags_on_users_papers(client, auth_headers, test_paper, test_tag):
+    """Test tag names attached to the user's papers are suggested"""
+    client.post(
+        f'/api/papers/{test_paper["id"]}/tags',
+        headers=auth_headers,
+        json={'tag_id': test_tag['id']}
+    )
+
+    response = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'mach'})
+
+    assert {'text': 'Machine Learning', 'type': 'tag'} in response.json['suggestions']
+
+
+def test_suggest_invalidated_on_write(client, auth_headers, test_paper):
+    """Test the cached index is rebuilt after the user's papers change"""
+    first = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'test'})
+    client.delete(f'/api/papers/{test_paper["id"]}', headers=auth_headers)
+    second = client.get('/api/search/suggest', headers=auth_headers, query_string={'q': 'test'})
+
+    assert len(first.json['suggestions']) == 1
+    assert second.json['suggestions'] == []
+
+
+def test_suggest_requires_query(client, auth_headers):
+    """Test an empty prefix is rejected"""
+    response = client.get('/api/search/suggest', headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_suggestion_cache_evicts_least_recently_used(app):
+    """Test the LRU keeps at most `capacity` users"""
+    from app.search.suggest import SuggestionCache
+
+    cache = SuggestionCache(capacity=2)
+    with app.app_context():
+        for user_id in (1, 2, 1, 3):
+            cache.get(user_id)
+
+    assert len(cache) == 2
+    assert list(cache._indexes) == [1, 3]
+
+
+
+def test_suggestion_cache_drops_index_built_during_write(app, test_user, monkeypatch):
+    """Test an index built while a write commits is not served afterwards"""
+    from app.search.suggest import SuggestionCache, SuggestionIndex
+    from app.utils.versions import _upsert_increment
+
+    build = SuggestionIndex.build
+    builds = []
+
+    def racing_build(user_id):
+        builds.append(user_id)
+        index = build(user_id)
+        if len(builds) == 1:
+            # Another worker commits while this index is being built
+            with db.engine.begin() as connection:
+                _upsert_increment(connection, user_id)
+        return index
+
+    monkeypatch.setattr(SuggestionIndex, 'build', staticmethod(racing_build))
+    cache = SuggestionCache()
+    with app.app_context():
+        cache.get(test_user['id'])
+        cache.get(test_user['id'])
+        cache.get(test_user['id'])
+
+    assert len(builds) == 2
+
+# ============= ANNOTATION SEARCH TESTS =============
+
+@pytest.mark.parametrize('backend', ['index', 'fulltext'])
+def test_search_covers_annotations(client, auth_headers, app, backend,
+                                   test_note, test_highlight, test_sticky_note):
+    """Test notes, highlights and sticky notes come back as typed results"""
+    app.config['SEARCH_BACKEND'] = backend
+
+    note = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test note about'})
+    highlight = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'highlighted text'})
+    sticky = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'review this section'})
+
+    assert note.json['results'][0] == {
+        'type': 'note',
+        'id': test_note['id'],
+        'paper_id': test_note['paper_id'],
+        'snippet': 'This is a test note about the paper.',
+        'score': 100
+    }
+    assert highlight.json['results'][0]['type'] == 'highlight'
+    assert highlight.json['results'][0]['offset'] == test_highlight['start_offset']
+    assert sticky.json['results'][0]['type'] == 'sticky_note'
+    assert sticky.json['results'][0]['paper_id'] == test_sticky_note['paper_id']
+
+
+def test_search_drops_deleted_highlight(client, auth_headers, test_highlight):
+    """Test deleting a highlight removes it from the index"""
+    client.delete(
+        f'/api/papers/{test_highlight["paper_id"]}/highlights/{test_highlight["id"]}',
+        headers=auth_headers
+    )
+
+    response = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'highlighted text'})
+
+    assert [r for r in response.json['results'] if r['type'] == 'highlight'] == []
+
+
+def test_search_follows_sticky_note_edit(client, auth_headers, test_sticky_note):
+    """Test editing a sticky note re-indexes its content"""
+    client.put(
+        f'/api/papers/sticky-notes/{test_sticky_note["id"]}',
+        headers=auth_headers,
+        json={'content': 'Compare with the baseline ablation'}
+    )
+
+    response = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'baseline ablation'})
+
+    assert response.json['results'][0]['id'] == test_sticky_note['id']
+
+
+def test_short_query_skips_annotation_scan(app, test_user, test_note, record_statements):
+    """Test a query too short for trigrams scans titles and names but not annotation bodies"""
+    from app.search.backends import IndexBackend
+
+    with app.app_context(), record_statements() as statements:
+        results = IndexBackend().search(test_user['id'], 'is')
+
+    assert all(r['type'] in ('paper', 'category') for r in results)
+    assert not any('note' in sql or 'highlights' in sql for sql in statements)
+
+def test_make_snippet_centers_on_match():
+    """Test long annotation text is cut around the match"""
+    from app.search.backends import make_snippet
+
+    text = 'x' * 300 + ' the needle is here ' + 'y' * 300
+    snippet = make_snippet(text, 'needle', width=60)
+
+    assert 'needle' in snippet
+    assert snippet.startswith('…') and snippet.endswith('…')
+
+
+# ============= SEARCH RESULT CACHE TESTS =============
+
+def test_search_repeated_query_hits_cache(client, auth_headers, test_paper):
+    """Test the second identical query is served from the cache"""
+    first = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'Test  Paper'})
+    second = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test paper'})
+    stats = client.get('/api/search/cache-stats', headers=auth_headers).json
+
+    assert first.json == second.json
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_search_cache_invalidated_on_write(client, auth_headers, test_paper):
+    """Test a write to the user's library makes cached pages unreachable"""
+    client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test paper'})
+    client.delete(f'/api/papers/{test_paper["id"]}', headers=auth_headers)
+    response = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test paper'})
+
+    assert [r for r in response.json['results'] if r['type'] == 'paper'] == []
+    assert client.get('/api/search/cache-stats', headers=auth_headers).json['hits'] == 0
+
+
+def test_search_cache_expires_and_evicts():
+    """Test entries die after the TTL and the LRU keeps `capacity` entries"""
+    from app.search.cache import SearchResultCache
+
+    now = [0.0]
+    cache = SearchResultCache(capacity=2, ttl=10, clock=lambda: now[0])
+    for query in ('a', 'b', 'c'):
+        cache.put(cache.key(1, (0, 0), query), query)
+
+    assert cache.get(cache.key(1, (0, 0), 'a')) is None
+    assert cache.get(cache.key(1, (0, 0), 'c')) == 'c'
+    now[0] = 11
+    assert cache.get(cache.key(1, (0, 0), 'c')) is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_search_cache_invalidated_by_other_process(client, auth_headers, app, test_paper, test_user):
+    """Test a write committed outside this process's session hooks still invalidates the cache"""
+    from sqlalchemy import update
+    from app.models.paper import Paper
+    from app.search.index import write_postings
+    from app.utils.versions import _upsert_increment
+
+    client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test research paper'})
+    # What another worker's commit leaves in the database
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(update(Paper.__table__).where(Paper.id == test_paper['id']).values(title='Renamed'))
+            write_postings(connection, 'paper', test_paper['id'], test_user['id'], ['Renamed'])
+            _upsert_increment(connection, test_user['id'])
+    response = client.get('/api/search-all', headers=auth_headers, query_string={'q': 'test research paper'})
+
+    assert [r for r in response.json['results'] if r['type'] == 'paper'] == []
+    assert client.get('/api/search/cache-stats', headers=auth_headers).json['hits'] == 0
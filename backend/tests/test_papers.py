@@ -105,6 +105,82 @@ def test_upload_paper_without_auth(client, mock_pdf_file):
     assert response.status_code == 401
 
 
+def test_upload_paper_extracts_text(client, auth_headers, app, text_pdf_file):
+    """Test the PDF text layer is captured per page, compressed"""
+    from app.models.paper_page import PaperPage
+
+    response = client.post(
+        '/api/papers/upload',
+        headers=auth_headers,
+        data={'title': 'Attention Is All You Need', 'file': text_pdf_file},
+        content_type='multipart/form-data'
+    )
+
+    assert response.status_code == 201
+    with app.app_context():
+        pages = PaperPage.query.filter_by(paper_id=response.json['paper_id'])\
+                               .order_by(PaperPage.page_number).all()
+        assert [p.page_number for p in pages] == [1, 2]
+        assert 'attention' in pages[0].text
+        assert b'attention' not in pages[0].content
+
+
+def test_upload_paper_unreadable_pdf_has_no_pages(client, auth_headers, app, mock_pdf_file):
+    """Test an unparseable PDF still uploads, just without body text"""
+    from app.models.paper_page import PaperPage
+
+    response = client.post(
+        '/api/papers/upload',
+        headers=auth_headers,
+        data={'title': 'Broken PDF', 'file': mock_pdf_file},
+        content_type='multipart/form-data'
+    )
+
+    assert response.status_code == 201
+    with app.app_context():
+        assert PaperPage.query.filter_by(paper_id=response.json['paper_id']).count() == 0
+
+
+def test_search_matches_pdf_body_with_pages(client, auth_headers, text_pdf_file):
+    """Test search-all matches inside the PDF and reports page numbers"""
+    upload = client.post(
+        '/api/papers/upload',
+        headers=auth_headers,
+        data={'title': 'Attention Is All You Need', 'file': text_pdf_file},
+        content_type='multipart/form-data'
+    )
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'translation benchmark'}
+    )
+
+    assert response.status_code == 200
+    result = response.json['results'][0]
+    assert result['id'] == upload.json['paper_id']
+    assert result['pages'] == [2]
+
+
+def test_search_body_index_dropped_with_paper(client, auth_headers, text_pdf_file):
+    """Test deleting a paper removes its pages from the body index"""
+    upload = client.post(
+        '/api/papers/upload',
+        headers=auth_headers,
+        data={'title': 'Attention Is All You Need', 'file': text_pdf_file},
+        content_type='multipart/form-data'
+    )
+    client.delete(f'/api/papers/{upload.json["paper_id"]}', headers=auth_headers)
+
+    response = client.get(
+        '/api/search-all',
+        headers=auth_headers,
+        query_string={'q': 'benchmark'}
+    )
+
+    assert response.json['results'] == []
+
+
 # ============= GET PAPERS TESTS =============
 
 def test_get_all_papers(client, auth_headers, test_paper):
@@ -155,6 +231,285 @@ def test_get_all_papers_ordering(client, auth_headers, app, test_user):
     assert papers[1]['title'] == 'Paper 1'
 
 
+def test_get_all_papers_keyset_pages(client, auth_headers, app, test_user):
+    """Test following next_cursor walks every paper exactly once, newest first"""
+    from app.models.paper import Paper
+    import datetime
+
+    base = datetime.datetime(2026, 1, 1)
+    with app.app_context():
+        for i in range(7):
+            # Pairs share an upload_date so the id tiebreaker is exercised
+            db.session.add(Paper(title=f'Paper {i}', file_path=f'/fake/{i}.pdf',
+                                 upload_date=base + datetime.timedelta(days=i // 2),
+                                 user_id=test_user['id']))
+        db.session.commit()
+
+    titles, cursor = [], None
+    while True:
+        params = {'limit': 3}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get('/api/papers', headers=auth_headers, query_string=params)
+        assert response.status_code == 200
+        assert len(response.json['papers']) <= 3
+        titles += [p['title'] for p in response.json['papers']]
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+
+    assert titles == [f'Paper {i}' for i in range(6, -1, -1)]
+
+
+@pytest.mark.parametrize('params', [{'cursor': 'not-a-cursor'}, {'limit': 'ten'}])
+def test_get_all_papers_rejects_bad_page_args(client, auth_headers, params):
+    """Test malformed cursors and limits are rejected"""
+    response = client.get('/api/papers', headers=auth_headers, query_string=params)
+
+    assert response.status_code == 400
+
+
+def test_get_all_papers_sparse_fields(client, auth_headers, test_paper):
+    """Test ?fields= limits each paper to the requested keys"""
+    response = client.get('/api/papers', headers=auth_headers,
+                          query_string={'fields': 'id,title, is_read'})
+
+    assert response.status_code == 200
+    assert response.json['papers'] == [{'id': test_paper['id'], 'title': 'Test Research Paper', 'is_read': False}]
+
+
+def test_get_all_papers_rejects_unknown_field(client, auth_headers):
+    """Test unknown field names are rejected"""
+    response = client.get('/api/papers', headers=auth_headers, query_string={'fields': 'title,password'})
+
+    assert response.status_code == 400
+    assert 'password' in response.json['error']
+
+
+def test_paper_projection_defers_unrequested_columns(app, test_paper):
+    """Test the projection leaves unrequested columns out of the SELECT"""
+    from app.models.paper import Paper
+    from app.utils.papers import paper_projection
+
+    with app.app_context():
+        paper = Paper.query.options(paper_projection(['title'])).one()
+
+        assert 'title' in paper.__dict__
+        assert 'abstract' not in paper.__dict__
+        assert 'file_path' not in paper.__dict__
+
+
+def test_get_all_papers_not_modified(client, auth_headers, app, test_paper, record_statements):
+    """Test a matching If-None-Match gets a 304 without running the view's queries"""
+    first = client.get('/api/papers', headers=auth_headers)
+    etag = first.headers['ETag']
+
+    with record_statements() as statements:
+        second = client.get('/api/papers', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+    assert len(statements) == 1 and 'data_version' in statements[0]
+
+
+def test_get_all_papers_etag_changes_on_write(client, auth_headers, second_auth_token, test_paper):
+    """Test the user's writes change the ETag while other users' writes do not"""
+    etag = client.get('/api/papers', headers=auth_headers).headers['ETag']
+
+    client.post('/api/categories/create', json={'name': 'Other'},
+                headers={'Authorization': f'Bearer {second_auth_token}'})
+    unchanged = client.get('/api/papers', headers={**auth_headers, 'If-None-Match': etag})
+    client.put(f'/api/papers/{test_paper["id"]}/toggle-read', headers=auth_headers)
+    changed = client.get('/api/papers', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.json['papers'][0]['is_read'] is True
+
+
+def test_get_all_papers_etag_depends_on_query(client, auth_headers, test_paper):
+    """Test different query strings get different ETags"""
+    full = client.get('/api/papers', headers=auth_headers)
+    sparse = client.get('/api/papers', headers=auth_headers, query_string={'fields': 'title'})
+
+    assert full.headers['ETag'] != sparse.headers['ETag']
+
+
+def test_paper_dates_serialized_as_iso8601(client, auth_headers, app, test_user):
+    """Test datetimes reach the client as ISO 8601 via the app's JSON provider"""
+    from app.models.paper import Paper
+    import datetime
+
+    with app.app_context():
+        db.session.add(Paper(title='Dated', file_path='/fake/d.pdf', user_id=test_user['id'],
+                             upload_date=datetime.datetime(2026, 3, 4, 5, 6, 7, 890)))
+        db.session.commit()
+
+    response = client.get('/api/papers', headers=auth_headers)
+
+    assert response.json['papers'][0]['upload_date'] == '2026-03-04T05:06:07.000890'
+
+
+def test_paper_workspace_in_one_response(client, auth_headers, app, test_paper, test_category, test_tag,
+                                         test_note, test_highlight, test_sticky_note, record_statements):
+    """Test the workspace bundles every panel of the reader in a few statements"""
+    from app.models.paper import Paper
+    from app.models.category import Category
+    from app.models.highlights_and_tags import Tags
+
+    with app.app_context():
+        paper = db.session.get(Paper, test_paper['id'])
+        paper.categories.append(db.session.get(Category, test_category['id']))
+        paper.tags.append(db.session.get(Tags, test_tag['id']))
+        db.session.commit()
+
+    with record_statements() as statements:
+        response = client.get(f'/api/papers/{test_paper["id"]}/workspace', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['paper']['id'] == test_paper['id']
+    assert [n['id'] for n in response.json['notes']] == [test_note['id']]
+    assert [h['id'] for h in response.json['highlights']] == [test_highlight['id']]
+    assert [s['id'] for s in response.json['sticky_notes']] == [test_sticky_note['id']]
+    assert [t['id'] for t in response.json['tags']] == [test_tag['id']]
+    assert response.json['categories'] == [{'id': test_category['id'], 'name': test_category['name']}]
+    assert len(statements) <= 6
+
+
+def test_paper_workspace_other_user(client, second_auth_token, test_paper):
+    """Test another user's paper is not found"""
+    response = client.get(f'/api/papers/{test_paper["id"]}/workspace',
+                          headers={'Authorization': f'Bearer {second_auth_token}'})
+
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def filter_library(app, test_user):
+    """Four papers spread over read status, dates, a tag and a two-level category tree"""
+    from app.models.paper import Paper
+    from app.models.category import Category
+    from app.models.highlights_and_tags import Tags
+    import datetime
+
+    with app.app_context():
+        parent = Category(name='ML', user_id=test_user['id'])
+        child = Category(name='GNN', user_id=test_user['id'], parent=parent)
+        tag = Tags(name='to-cite', color='#000000')
+        papers = [
+            Paper(title='Bravo', authors='Zed', file_path='/fake/b.pdf', is_read=True,
+                  upload_date=datetime.datetime(2026, 1, 1), user_id=test_user['id'],
+                  categories=[parent], tags=[tag]),
+            Paper(title='Alpha', authors='Young', file_path='/fake/a.pdf', is_read=False,
+                  upload_date=datetime.datetime(2026, 2, 1), user_id=test_user['id'],
+                  categories=[child]),
+            Paper(title='Delta', authors='Xu', file_path='/fake/d.pdf', is_read=False,
+                  upload_date=datetime.datetime(2026, 3, 1), user_id=test_user['id'],
+                  categories=[parent, child], tags=[tag]),
+            Paper(title='Charlie', authors='Wu', file_path='/fake/c.pdf', is_read=True,
+                  upload_date=datetime.datetime(2026, 4, 1), user_id=test_user['id'])
+        ]
+        db.session.add_all(papers)
+        db.session.commit()
+        return {'parent': parent.id, 'child': child.id, 'tag': tag.id}
+
+
+@pytest.mark.parametrize('params, expected', [
+    ({}, ['Charlie', 'Delta', 'Alpha', 'Bravo']),
+    ({'sort': 'oldest'}, ['Bravo', 'Alpha', 'Delta', 'Charlie']),
+    ({'sort': 'title'}, ['Alpha', 'Bravo', 'Charlie', 'Delta']),
+    ({'sort': 'author'}, ['Charlie', 'Delta', 'Alpha', 'Bravo']),
+    ({'is_read': 'true'}, ['Charlie', 'Bravo']),
+    ({'is_read': 'false', 'sort': 'title'}, ['Alpha', 'Delta']),
+    ({'uploaded_after': '2026-02-01', 'uploaded_before': '2026-04-01'}, ['Delta', 'Alpha']),
+    ({'tag_id': 'TAG'}, ['Delta', 'Bravo']),
+    ({'category_id': 'PARENT'}, ['Delta', 'Bravo']),
+    ({'category_id': 'PARENT', 'include_descendants': '1'}, ['Delta', 'Alpha', 'Bravo']),
+    ({'category_id': 'CHILD', 'tag_id': 'TAG'}, ['Delta']),
+])
+def test_get_all_papers_filters_and_sorts(client, auth_headers, filter_library, params, expected):
+    """Test filters and sort orders are applied server-side"""
+    ids = {'TAG': filter_library['tag'], 'PARENT': filter_library['parent'], 'CHILD': filter_library['child']}
+    params = {k: ids.get(v, v) for k, v in params.items()}
+
+    response = client.get('/api/papers', headers=auth_headers, query_string=params)
+
+    assert response.status_code == 200
+    assert [p['title'] for p in response.json['papers']] == expected
+
+
+def test_get_all_papers_pages_sorted_by_title(client, auth_headers, filter_library):
+    """Test cursors follow the requested sort order"""
+    first = client.get('/api/papers', headers=auth_headers, query_string={'sort': 'title', 'limit': 3})
+    second = client.get('/api/papers', headers=auth_headers,
+                        query_string={'sort': 'title', 'limit': 3, 'cursor': first.json['next_cursor']})
+    reused = client.get('/api/papers', headers=auth_headers,
+                        query_string={'sort': 'oldest', 'cursor': first.json['next_cursor']})
+
+    assert [p['title'] for p in first.json['papers'] + second.json['papers']] == ['Alpha', 'Bravo', 'Charlie', 'Delta']
+    assert second.json['next_cursor'] is None
+    assert reused.status_code == 400
+
+
+@pytest.mark.parametrize('params', [
+    {'is_read': 'maybe'}, {'tag_id': 'x'}, {'uploaded_after': 'yesterday'}, {'sort': 'random'}
+])
+def test_get_all_papers_rejects_bad_filters(client, auth_headers, params):
+    """Test malformed filter values are rejected"""
+    response = client.get('/api/papers', headers=auth_headers, query_string=params)
+
+    assert response.status_code == 400
+
+
+def test_get_all_papers_foreign_category(client, second_auth_token, filter_library):
+    """Test filtering by another user's category is a 404"""
+    response = client.get('/api/papers', headers={'Authorization': f'Bearer {second_auth_token}'},
+                          query_string={'category_id': filter_library['parent']})
+
+    assert response.status_code == 404
+
+
+def test_batch_get_papers(client, auth_headers, app, test_user, second_user):
+    """Test papers come back in request order with per-id errors for the rest"""
+    from app.models.paper import Paper
+
+    with app.app_context():
+        mine = [Paper(title=f'Mine {i}', file_path=f'/fake/{i}.pdf', user_id=test_user['id']) for i in range(3)]
+        theirs = Paper(title='Theirs', file_path='/fake/t.pdf', user_id=second_user['id'])
+        db.session.add_all(mine + [theirs])
+        db.session.commit()
+        mine_ids, their_id = [p.id for p in mine], theirs.id
+
+    response = client.post('/api/papers/batch-get', headers=auth_headers,
+                           json={'ids': [mine_ids[2], their_id, 'x', mine_ids[0], 9999, mine_ids[2]]})
+
+    assert response.status_code == 200
+    assert [p['title'] for p in response.json['papers']] == ['Mine 2', 'Mine 0']
+    assert response.json['errors'] == [
+        {'id': 'x', 'error': 'Invalid paper id'},
+        {'id': their_id, 'error': 'Paper not found'},
+        {'id': 9999, 'error': 'Paper not found'}
+    ]
+
+
+def test_batch_get_papers_sparse_fields(client, auth_headers, test_paper):
+    """Test ?fields= applies to batch fetches"""
+    response = client.post('/api/papers/batch-get', headers=auth_headers,
+                           query_string={'fields': 'id,title'}, json={'ids': [test_paper['id']]})
+
+    assert response.json['papers'] == [{'id': test_paper['id'], 'title': 'Test Research Paper'}]
+
+
+@pytest.mark.parametrize('body', [None, {}, {'ids': 5}, {'ids': list(range(101))}])
+def test_batch_get_papers_rejects_bad_body(client, auth_headers, body):
+    """Test missing, non-list and oversized id lists are rejected"""
+    response = client.post('/api/papers/batch-get', headers=auth_headers, json=body)
+
+    assert response.status_code == 400
+
+
 def test_get_single_paper(client, auth_headers, test_paper):
     """Test getting a specific paper"""
     response = client.get(
@@ -542,4 +897,131 @@ def test_paper_count_consistency(client, auth_headers, app, test_user):
         db.session.commit()
     
     response = client.get('/api/papers', headers=auth_headers)
-    assert len(response.json['papers']) == 5
\ No newline at end of file
+    assert len(response.json['papers']) == 5
+
+# ============= RELATED PAPERS TESTS =============
+
+def _add_paper(app, user_id, title, abstract):
+    from app.models.paper import Paper
+
+    with app.app_context():
+        paper = Paper(title=title, abstract=abstract, file_path='/fake/related.pdf', user_id=user_id)
+        db.session.add(paper)
+        db.session.commit()
+        return paper.id
+
+
+def test_related_papers_ranked_by_similarity(client, auth_headers, app, test_user):
+    """Test the closest paper by content comes first and unrelated ones last"""
+    base = _add_paper(app, test_user['id'], 'Protein folding with deep networks',
+                      'We predict protein structure from amino acid sequences.')
+    close = _add_paper(app, test_user['id'], 'Protein structure prediction',
+                       'Amino acid sequences determine protein folding and structure.')
+    far = _add_paper(app, test_user['id'], 'Medieval trade routes',
+                     'Merchants crossed deserts with caravans of camels.')
+
+    response = client.get(f'/api/papers/{base}/related', headers=auth_headers)
+
+    assert response.status_code == 200
+    related = [p['id'] for p in response.json['related']]
+    assert related[0] == close
+    assert base not in related
+    assert far not in related[:1]
+
+
+def test_related_papers_updated_incrementally(client, auth_headers, app, test_user):
+    """Test uploads and deletes are folded into the cached matrix without a rebuild"""
+    from app.search import get_related_cache
+
+    base = _add_paper(app, test_user['id'], 'Graph neural networks', 'Message passing on graphs.')
+    client.get(f'/api/papers/{base}/related', headers=auth_headers)
+    with app.app_context():
+        index = get_related_cache().get(test_user['id'])
+
+    added = _add_paper(app, test_user['id'], 'Message passing neural networks', 'Graphs and message passing.')
+    after_add = client.get(f'/api/papers/{base}/related', headers=auth_headers)
+    client.delete(f'/api/papers/{added}', headers=auth_headers)
+    after_delete = client.get(f'/api/papers/{base}/related', headers=auth_headers)
+
+    with app.app_context():
+        assert get_related_cache().get(test_user['id']) is index
+    assert [p['id'] for p in after_add.json['related']] == [added]
+    assert after_delete.json['related'] == []
+
+
+def test_related_cache_sees_papers_written_elsewhere(client, auth_headers, app, test_user):
+    """Test an index that was never told about a write still picks it up from the data version"""
+    from app.search.related import RelatedCache
+
+    base = _add_paper(app, test_user['id'], 'Graph neural networks', 'Message passing on graphs.')
+    # Not the app's cache, so nothing in this process can reach it on commit
+    cache = RelatedCache()
+    with app.app_context():
+        cache.get(test_user['id'])
+
+    added = _add_paper(app, test_user['id'], 'Message passing neural networks', 'Graphs and message passing.')
+    with app.app_context():
+        related = cache.get(test_user['id']).related(base)
+
+    assert [paper_id for paper_id, _ in related] == [added]
+
+
+def test_related_cache_ignores_read_toggles(client, auth_headers, app, test_user, monkeypatch):
+    """Test toggling read status neither re-vectorises papers nor counts as churn"""
+    from app.search import related
+
+    ids = [_add_paper(app, test_user['id'], f'Paper about topic {i}', 'Some abstract.') for i in range(12)]
+    client.get(f'/api/papers/{ids[0]}/related', headers=auth_headers)
+
+    loads = []
+    load_documents = related.load_documents
+    monkeypatch.setattr(related, 'load_documents',
+                        lambda user_id, paper_ids=None: loads.append(paper_ids) or load_documents(user_id, paper_ids))
+    for paper_id in ids[:10]:
+        client.put(f'/api/papers/{paper_id}/toggle-read', headers=auth_headers)
+    client.get(f'/api/papers/{ids[0]}/related', headers=auth_headers)
+    client.get(f'/api/papers/{ids[0]}/related', headers=auth_headers)
+
+    assert loads == []
+    with app.app_context():
+        assert related.get_related_cache().get(test_user['id']).churn == 0
+
+
+def test_related_cache_rebuilds_do_not_block_other_users(monkeypatch):
+    """Test one user's slow rebuild leaves other users' lookups running"""
+    import threading
+    from app.search import related
+
+    loading, release = threading.Event(), threading.Event()
+
+    def load_documents(user_id, paper_ids=None):
+        if user_id == 1:
+            loading.set()
+            release.wait(5)
+        return {}
+
+    monkeypatch.setattr(related, 'load_documents', load_documents)
+    monkeypatch.setattr(related, 'data_version', lambda user_id: (0, 0))
+    cache = related.RelatedCache()
+    slow = threading.Thread(target=cache.get, args=(1,))
+    slow.start()
+    assert loading.wait(5)
+
+    other = threading.Thread(target=cache.get, args=(2,))
+    other.start()
+    other.join(2)
+    finished_while_loading = not other.is_alive()
+    release.set()
+    slow.join(5)
+
+    assert finished_while_loading
+    assert len(cache) == 2
+
+def test_related_papers_other_user(client, second_auth_token, test_paper):
+    """Test related papers of another user's paper are not exposed"""
+    response = client.get(
+        f'/api/papers/{test_paper["id"]}/related',
+        headers={'Authorization': f'Bearer {second_auth_token}'}
+    )
+
+    assert response.status_code == 404
@@ -488,4 +488,17 @@ def test_tag_with_special_characters(client, auth_headers):
     )
     
     assert response.status_code == 201
-    assert response.json['tag']['name'] == 'ML/AI & Deep Learning (2024)'
\ No newline at end of file
+    assert response.json['tag']['name'] == 'ML/AI & Deep Learning (2024)'
+
+def test_get_tags_etag_follows_shared_writes(client, auth_headers, second_auth_token, test_tag):
+    """Test a tag written by any user invalidates everyone's tag list ETag"""
+    etag = client.get('/api/tags', headers=auth_headers).headers['ETag']
+    cached = client.get('/api/tags', headers={**auth_headers, 'If-None-Match': etag})
+
+    client.post('/api/tags', json={'name': 'Shared', 'color': '#123456'},
+                headers={'Authorization': f'Bearer {second_auth_token}'})
+    refreshed = client.get('/api/tags', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert refreshed.status_code == 200
+    assert len(refreshed.json['tags']) == 2
@@ -1,7 +1,6 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { dashboardService } from '../services/dashboardService';
-import { paperService } from '../services/paperService';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 import '../css/App.css';
@@ -10,7 +9,6 @@ function DashboardPage() {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [dashboardData, setDashboardData] = useState(null);
-    const [papers, setPapers] = useState([]);
 
     useEffect(() => {
         fetchDashboardData();
@@ -21,13 +19,9 @@ function DashboardPage() {
         setError('');
         
         try {
-            const [dashData, papersData] = await Promise.all([
-                dashboardService.getDashboardData(),
-                paperService.getAllPapers()
-            ]);
-            
+            // Recent papers and library totals come in one response
+            const dashData = await dashboardService.getDashboardData();
             setDashboardData(dashData);
-            setPapers(papersData.papers || []);
         } catch (err) {
             setError(err.response?.data?.error || 'Failed to load dashboard');
         } finally {
@@ -53,8 +47,8 @@ function DashboardPage() {
         );
     }
 
-    const totalPapers = papers.length;
-    const readPapers = papers.filter(p => p.is_read).length;
+    const totalPapers = dashboardData?.paper_stats?.total ?? 0;
+    const readPapers = dashboardData?.paper_stats?.read ?? 0;
     const unreadPapers = totalPapers - readPapers;
 
     return (
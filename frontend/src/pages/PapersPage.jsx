@@ -7,30 +7,43 @@ import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 import '../css/App.css';
 
+const PAGE_SIZE = 20;
+
 function PapersPage() {
     const [papers, setPapers] = useState([]);
     const [filteredPapers, setFilteredPapers] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [nextCursor, setNextCursor] = useState(null);
     const [error, setError] = useState('');
     const [searchQuery, setSearchQuery] = useState('');
     const [filterStatus, setFilterStatus] = useState('all'); // all, read, unread
     const [sortBy, setSortBy] = useState('date'); // date, title, author
 
+    // Status and sort are applied by the server
     useEffect(() => {
         fetchPapers();
-    }, []);
+    }, [filterStatus, sortBy]);
 
     useEffect(() => {
         filterAndSortPapers();
-    }, [papers, searchQuery, filterStatus, sortBy]);
+    }, [papers, searchQuery, filterStatus]);
+
+    const fetchPage = (cursor) => paperService.getPapers({
+        is_read: filterStatus === 'all' ? undefined : filterStatus === 'read',
+        sort: sortBy === 'date' ? 'newest' : sortBy,
+        limit: PAGE_SIZE,
+        cursor
+    });
 
     const fetchPapers = async () => {
         setLoading(true);
         setError('');
         
         try {
-            const response = await paperService.getAllPapers();
+            const response = await fetchPage();
             setPapers(response.papers || []);
+            setNextCursor(response.next_cursor);
         } catch (err) {
             setError(err.response?.data?.error || 'Failed to load papers');
         } finally {
@@ -38,6 +51,21 @@ function PapersPage() {
         }
     };
 
+    // Next page, following the cursor of the last one loaded
+    const loadMore = async () => {
+        setLoadingMore(true);
+        
+        try {
+            const response = await fetchPage(nextCursor);
+            setPapers(prev => [...prev, ...(response.papers || [])]);
+            setNextCursor(response.next_cursor);
+        } catch (err) {
+            alert('Failed to load more papers');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const filterAndSortPapers = () => {
         let filtered = [...papers];
 
@@ -50,25 +78,13 @@ function PapersPage() {
             );
         }
 
-        // Status filter
+        // Status filter (keeps papers toggled since the last fetch in line)
         if (filterStatus === 'read') {
             filtered = filtered.filter(p => p.is_read);
         } else if (filterStatus === 'unread') {
             filtered = filtered.filter(p => !p.is_read);
         }
 
-        // Sort
-        filtered.sort((a, b) => {
-            if (sortBy === 'title') {
-                return (a.title || '').localeCompare(b.title || '');
-            } else if (sortBy === 'author') {
-                return (a.authors || '').localeCompare(b.authors || '');
-            } else {
-                // date
-                return new Date(b.upload_date) - new Date(a.upload_date);
-            }
-        });
-
         setFilteredPapers(filtered);
     };
 
@@ -202,6 +218,19 @@ function PapersPage() {
                             </div>
                         </>
                     )}
+
+                    {/* Load More */}
+                    {!error && nextCursor && (
+                        <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+                            <button
+                                onClick={loadMore}
+                                className="btn btn-secondary"
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Loading...' : 'Load More'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             </div>
         </>
@@ -10,12 +10,27 @@ export const categoryService = {
         return response.data;
     },
 
+    // Get all categories already nested, with paper counts
+    getCategoryTree: async () => {
+        const response = await api.get('/categories/tree');
+        return response.data;
+    },
+
     // Get specific category with its papers
     getCategory: async (categoryId) => {
         const response = await api.get(`/categories/view/${categoryId}`);
         return response.data;
     },
 
+    // Get one page of a category's papers: { papers, next_cursor }
+    // includeDescendants also lists papers filed in its subcategories.
+    getCategoryPapers: async (categoryId, { limit, cursor, includeDescendants, ...filters } = {}) => {
+        const response = await api.get(`/categories/${categoryId}/papers`, {
+            params: { limit, cursor, include_descendants: includeDescendants ? 1 : undefined, ...filters }
+        });
+        return response.data;
+    },
+
     // Create new category
     createCategory: async (categoryData) => {
         const response = await api.post('/categories/create', {
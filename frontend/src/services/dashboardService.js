@@ -9,9 +9,19 @@ export const dashboardService = {
     },
 
     // Search papers and categories
-    searchAll: async (query) => {
+    // Returns one ranked page: { results, next_cursor, total_estimate }
+    // Pass the previous page's next_cursor to load the following page
+    searchAll: async (query, { limit, cursor } = {}) => {
         const response = await api.get('/search-all', {
-            params: { q: query }
+            params: { q: query, limit, cursor }
+        });
+        return response.data;
+    },
+
+    // Search-as-you-type completions: { suggestions: [{ text, type }] }
+    suggest: async (prefix) => {
+        const response = await api.get('/search/suggest', {
+            params: { q: prefix }
         });
         return response.data;
     }
@@ -2,9 +2,14 @@
 import api from './api';
 
 export const paperService = {
-    // Get all papers for current user
-    getAllPapers: async () => {
-        const response = await api.get('/papers');
+    // Get one page of papers: { papers, next_cursor }
+    // Pass the previous page's next_cursor to load the following page.
+    // Filters: is_read, tag_id, category_id, include_descendants,
+    // uploaded_after, uploaded_before; sort: newest | oldest | title | author
+    getPapers: async ({ limit, cursor, ...filters } = {}) => {
+        const response = await api.get('/papers', {
+            params: { limit, cursor, ...filters }
+        });
         return response.data;
     },
 
@@ -14,6 +19,29 @@ export const paperService = {
         return response.data;
     },
 
+    // Get several papers in one request: { papers, errors: [{ id, error }] }
+    batchGetPapers: async (paperIds, { fields } = {}) => {
+        const response = await api.post('/papers/batch-get', { ids: paperIds }, {
+            params: { fields }
+        });
+        return response.data;
+    },
+
+    // Get everything the reader shows for a paper in one request:
+    // { paper, notes, highlights, sticky_notes, tags, categories }
+    getPaperWorkspace: async (paperId) => {
+        const response = await api.get(`/papers/${paperId}/workspace`);
+        return response.data;
+    },
+
+    // Get papers similar to this one
+    getRelatedPapers: async (paperId, limit = 10) => {
+        const response = await api.get(`/papers/${paperId}/related`, {
+            params: { limit }
+        });
+        return response.data;
+    },
+
     // Upload new paper with PDF file
     uploadPaper: async (formData) => {
         const response = await api.post('/papers/upload', formData, {
@@ -24,6 +52,14 @@ export const paperService = {
         return response.data;
     },
 
+    // Download the whole library as NDJSON (one paper per line)
+    exportLibrary: async () => {
+        const response = await api.get('/export.ndjson', {
+            responseType: 'blob'
+        });
+        return response.data;
+    },
+
     // Delete paper
     deletePaper: async (paperId) => {
         const response = await api.delete(`/papers/${paperId}`);